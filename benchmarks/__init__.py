@@ -0,0 +1,6 @@
+"""Нагрузочные замеры blogicum; запускаются из корня репозитория.
+
+    python -m benchmarks.run --scale small --out before.json
+    python -m benchmarks.run --scale small --out after.json
+    python -m benchmarks.compare before.json after.json
+"""
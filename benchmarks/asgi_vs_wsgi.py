@@ -0,0 +1,171 @@
+"""Пропускная способность страниц чтения: WSGI против ASGI.
+
+    python -m benchmarks.asgi_vs_wsgi --requests 400 --concurrency 20 \
+        --slow-clients 50
+
+Поднимает на свободных портах два настоящих сервера: многопоточный
+WSGI-сервер Django (синхронные представления, поток на соединение) и
+uvicorn (ASGI, асинхронные представления из `blogicum.urls_async`).
+Пока быстрые клиенты прогоняют анонимные GET-маршруты на наполненной
+базе, медленные клиенты держат соединения: отправляют запрос по байту
+и читают ответ маленькими порциями с паузами, как клиенты на плохой
+сети. Кэш страниц по умолчанию выключен, чтобы сравнивать обработку
+запроса, а не попадания в кэш. Результат печатается в JSON.
+"""
+import argparse
+import json
+import socket
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from benchmarks import env
+
+env.setup_django('blogicum.settings_asgi')
+
+import uvicorn  # noqa: E402
+from django.core.asgi import get_asgi_application  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from benchmarks.routes import ANONYMOUS, build_routes  # noqa: E402
+from benchmarks.run import describe, local_server  # noqa: E402
+from benchmarks.seed import SCALES, seed  # noqa: E402
+
+SLOW_CHUNK = 64
+
+
+def summary(durations, elapsed):
+    return {
+        **describe(durations),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(durations) / elapsed, 1),
+    }
+
+
+@contextmanager
+def asgi_server():
+    """uvicorn в отдельном потоке на свободном порту."""
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    server = uvicorn.Server(uvicorn.Config(
+        get_asgi_application(), lifespan='off', log_level='warning'
+    ))
+    thread = threading.Thread(
+        target=server.run, kwargs={'sockets': [sock]}, daemon=True
+    )
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError('uvicorn не запустился')
+        time.sleep(0.01)
+    try:
+        yield f'http://127.0.0.1:{sock.getsockname()[1]}'
+    finally:
+        server.should_exit = True
+        thread.join()
+        sock.close()
+
+
+def slow_client(base_url, url, delay, stop):
+    """Повторяет медленный запрос, пока не выставлен `stop`."""
+    address = urllib.parse.urlsplit(base_url)
+    host = (address.hostname, address.port)
+    request = (
+        f'GET {url} HTTP/1.1\r\nHost: {address.netloc}\r\n'
+        'Connection: close\r\n\r\n'
+    ).encode()
+    while not stop.is_set():
+        with socket.create_connection(host) as sock:
+            for byte in request:
+                if stop.is_set():
+                    return
+                sock.sendall(bytes([byte]))
+                time.sleep(delay)
+            while sock.recv(SLOW_CHUNK) and not stop.is_set():
+                time.sleep(delay)
+
+
+@contextmanager
+def slow_clients(base_url, urls, count, delay):
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=slow_client,
+            args=(base_url, urls[number % len(urls)], delay, stop),
+            daemon=True,
+        )
+        for number in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def run(base_url, urls, options):
+    def fetch(number):
+        started = time.perf_counter()
+        with urllib.request.urlopen(
+            base_url + urls[number % len(urls)]
+        ) as response:
+            response.read()
+        return time.perf_counter() - started
+
+    with slow_clients(
+        base_url, urls, options.slow_clients, options.slow_delay
+    ):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options.concurrency) as pool:
+            durations = list(pool.map(fetch, range(options.requests)))
+        elapsed = time.perf_counter() - started
+    return summary(durations, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Страницы чтения под WSGI и ASGI.'
+    )
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument(
+        '--slow-clients', type=int, default=50,
+        help='Сколько соединений одновременно держат медленные клиенты.'
+    )
+    parser.add_argument(
+        '--slow-delay', type=float, default=0.05,
+        help='Пауза медленного клиента между порциями, в секундах.'
+    )
+    parser.add_argument(
+        '--with-cache', action='store_true',
+        help='Не отключать кэш страниц и карточек.'
+    )
+    options = parser.parse_args()
+
+    with env.temporary_database():
+        overrides = {} if options.with_cache else env.no_page_caches()
+        with override_settings(**overrides):
+            urls = [
+                route.url for route in build_routes(seed(
+                    SCALES[options.scale]
+                ))
+                if route.user == ANONYMOUS and route.method == 'get'
+            ]
+            result = {}
+            with override_settings(ROOT_URLCONF='blogicum.urls'):
+                with local_server() as base_url:
+                    result['wsgi'] = run(base_url, urls, options)
+            with asgi_server() as base_url:
+                result['asgi'] = run(base_url, urls, options)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Сравнение двух отчётов `benchmarks.run`.
+
+    python -m benchmarks.compare before.json after.json --threshold 10
+
+Печатает изменение p95 и числа запросов к базе по каждому маршруту и
+завершается с кодом 1, если p95 вырос больше порога или запросов стало
+больше.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare(before, after, threshold):
+    """Строки отчёта и признак регрессии."""
+    lines = []
+    regressed = False
+    for mode in ('client', 'server'):
+        old, new = before.get(mode, {}), after.get(mode, {})
+        for label in sorted(set(old) & set(new) - {'_total'}):
+            was, now = old[label], new[label]
+            change = (now['p95_ms'] - was['p95_ms']) / was['p95_ms'] * 100
+            queries = now.get('queries', 0) - was.get('queries', 0)
+            slower = change > threshold or queries > 0
+            regressed = regressed or slower
+            lines.append(
+                f'{"!" if slower else " "} {mode:6} {label:55} '
+                f'p95 {was["p95_ms"]:8.2f} → {now["p95_ms"]:8.2f} ms '
+                f'({change:+6.1f}%)'
+                + (f', запросов {queries:+d}' if queries else '')
+            )
+        for label in sorted(set(old) ^ set(new) - {'_total'}):
+            lines.append(
+                f'  {mode:6} {label:55} '
+                + ('только в первом' if label in old else 'только во втором')
+            )
+        if '_total' in old and '_total' in new:
+            lines.append(
+                f'  {mode:6} {"всего":55} rps '
+                f'{old["_total"]["rps"]} → {new["_total"]["rps"]}'
+            )
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение отчётов.')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument(
+        '--threshold', type=float, default=10,
+        help='Допустимый рост p95, в процентах.'
+    )
+    options = parser.parse_args()
+    lines, regressed = compare(
+        load(options.before), load(options.after), options.threshold
+    )
+    print('\n'.join(lines))
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Окружение замеров: настройка Django, временные база и кэш."""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def setup_django(settings_module='blogicum.settings'):
+    """Настраивает Django, если этого ещё не сделал вызывающий код."""
+    from django.apps import apps
+    if apps.ready:
+        return
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def no_page_caches():
+    """Настройки без кэша страниц и карточек публикаций.
+
+    Версии в кэше shared нужны для работы сайта, поэтому он остаётся.
+    """
+    from django.conf import settings
+    return {
+        'CACHES': {
+            **settings.CACHES,
+            settings.FEED_PAGE_CACHE_ALIAS: {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+            },
+        },
+        'POST_CARD_CACHE_TIMEOUT': 0,
+    }
+
+
+@contextmanager
+def temporary_database():
+    """Файловая база, каталог media и общий кэш во временном каталоге.
+
+    База файловая, а не в памяти, чтобы к ней могли обращаться потоки
+    локального сервера. Реплики становятся зеркалами временной базы.
+    Версии, которые сбрасывают замеры, не попадают в общий кэш сервера
+    разработки на той же машине.
+    """
+    from django.conf import settings
+    from django.db import connection, connections
+    from django.test.utils import (
+        override_settings,
+        setup_test_environment,
+        teardown_test_environment
+    )
+    setup_test_environment(debug=False)
+    with tempfile.TemporaryDirectory() as directory:
+        connection.settings_dict['TEST']['NAME'] = str(
+            Path(directory) / 'bench.sqlite3'
+        )
+        old_name = connection.creation.create_test_db(verbosity=0)
+        for alias in settings.DATABASE_REPLICAS:
+            connections[alias].close()
+            connections[alias].creation.set_as_test_mirror(
+                connection.settings_dict
+            )
+        media = Path(directory) / 'media'
+        media.mkdir()
+        caches = {
+            **settings.CACHES,
+            'shared': {
+                **settings.CACHES['shared'],
+                'LOCATION': str(Path(directory) / 'shared-cache'),
+            },
+        }
+        try:
+            with override_settings(MEDIA_ROOT=media, CACHES=caches):
+                yield Path(directory)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
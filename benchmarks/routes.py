@@ -0,0 +1,117 @@
+"""Маршруты замера: все адреса из blog/urls.py и pages/urls.py."""
+from dataclasses import dataclass, field
+from urllib.parse import urlencode, urlsplit
+
+from django.urls import URLResolver, reverse
+
+from blog import urls as blog_urls
+from pages import urls as pages_urls
+
+ANONYMOUS = 'anonymous'
+AUTHOR = 'author'
+READER = 'reader'
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str
+    url: str
+    user: str = ANONYMOUS
+    method: str = 'get'
+    data: dict = field(default=None, hash=False)
+    status: int = 200
+
+    @property
+    def label(self):
+        query = urlsplit(self.url).query
+        query = f'?{query}' if query else ''
+        return f'{self.method.upper()} {self.name}{query} [{self.user}]'
+
+
+def build_routes(dataset):
+    post = dataset.post
+    comment = dataset.comment
+    post_kwargs = {'pk': post.pk}
+    comment_kwargs = {'post_id': post.pk, 'pk': comment.pk}
+    return [
+        Route('blog:index', reverse('blog:index')),
+        Route('blog:index', reverse('blog:index') + '?page=2'),
+        Route('blog:index', reverse('blog:index'), READER),
+        Route(
+            'blog:category_posts',
+            reverse('blog:category_posts', args=[dataset.category.slug]),
+        ),
+        Route(
+            'blog:profile',
+            reverse('blog:profile', args=[dataset.author.username]),
+        ),
+        Route(
+            'blog:profile',
+            reverse('blog:profile', args=[dataset.author.username]),
+            AUTHOR,
+        ),
+        Route(
+            'blog:search', reverse('blog:search') + '?' + urlencode({
+                'q': 'Марс'
+            }),
+        ),
+        Route('blog:post_detail', reverse('blog:post_detail', args=[post.pk])),
+        Route(
+            'blog:post_detail',
+            reverse('blog:post_detail', args=[post.pk]),
+            READER,
+        ),
+        Route(
+            'blog:post_comments',
+            reverse('blog:post_comments', args=[post.pk]),
+        ),
+        Route('blog:create_post', reverse('blog:create_post'), AUTHOR),
+        Route(
+            'blog:edit_post', reverse('blog:edit_post', kwargs=post_kwargs),
+            AUTHOR,
+        ),
+        Route(
+            'blog:delete_post',
+            reverse('blog:delete_post', kwargs=post_kwargs),
+            AUTHOR,
+        ),
+        Route('blog:edit_profile', reverse('blog:edit_profile'), AUTHOR),
+        Route(
+            'blog:add_comment',
+            reverse('blog:add_comment', kwargs=post_kwargs),
+            READER,
+            method='post',
+            data={'text': 'Комментарий из замера'},
+            status=302,
+        ),
+        Route(
+            'blog:edit_comment',
+            reverse('blog:edit_comment', kwargs=comment_kwargs),
+            AUTHOR,
+        ),
+        Route(
+            'blog:delete_comment',
+            reverse('blog:delete_comment', kwargs=comment_kwargs),
+            AUTHOR,
+        ),
+        Route('pages:about', reverse('pages:about')),
+        Route('pages:rules', reverse('pages:rules')),
+    ]
+
+
+def _names(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _names(pattern.url_patterns)
+        elif pattern.name:
+            yield pattern.name
+
+
+def missing_routes(routes):
+    """Имена маршрутов приложений, для которых нет замера."""
+    declared = {
+        f'{module.app_name}:{name}'
+        for module in (blog_urls, pages_urls)
+        for name in _names(module.urlpatterns)
+    }
+    return sorted(declared - {route.name for route in routes})
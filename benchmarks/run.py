@@ -0,0 +1,245 @@
+"""Замер всех маршрутов blog и pages на наполненной базе.
+
+    python -m benchmarks.run --scale small --out results.json
+
+Каждый маршрут прогоняется через тестовый клиент Django (время, число
+запросов к базе, размер ответа), а GET-маршруты — ещё и через локальный
+многопоточный WSGI-сервер с параллельными клиентами. Отчёт в JSON можно
+сравнить с предыдущим командой `python -m benchmarks.compare`.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+
+from benchmarks import env
+
+env.setup_django()
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.core.servers.basehttp import (  # noqa: E402
+    ThreadedWSGIServer,
+    WSGIRequestHandler
+)
+from django.db import DEFAULT_DB_ALIAS, connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    override_settings
+)
+from django.utils import timezone  # noqa: E402
+
+from benchmarks.routes import (  # noqa: E402
+    ANONYMOUS,
+    AUTHOR,
+    READER,
+    build_routes,
+    missing_routes
+)
+from benchmarks.seed import SCALES, seed  # noqa: E402
+from blog.management.commands.profile_report import (  # noqa: E402
+    percentile
+)
+
+
+def describe(durations, sizes=None, queries=None):
+    result = {
+        'requests': len(durations),
+        'p50_ms': round(percentile(durations, 50) * 1000, 2),
+        'p95_ms': round(percentile(durations, 95) * 1000, 2),
+        'p99_ms': round(percentile(durations, 99) * 1000, 2),
+    }
+    if sizes:
+        result['bytes'] = round(sum(sizes) / len(sizes))
+    if queries:
+        result['queries'] = max(queries)
+    return result
+
+
+def make_clients(dataset):
+    clients = {ANONYMOUS: Client(), AUTHOR: Client(), READER: Client()}
+    clients[AUTHOR].force_login(dataset.author)
+    clients[READER].force_login(dataset.reader)
+    return clients
+
+
+def read_content(response):
+    if response.streaming:
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+@contextmanager
+def captured_queries():
+    """Запросы ко всем базам, включая реплики."""
+    with ExitStack() as stack:
+        yield [
+            stack.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in (DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS)
+        ]
+
+
+def run_client(routes, clients, repeat):
+    results = {}
+    for route in routes:
+        client = clients[route.user]
+        durations, sizes, queries = [], [], []
+        for _ in range(repeat):
+            with captured_queries() as captured:
+                started = time.perf_counter()
+                response = getattr(client, route.method)(
+                    route.url, route.data
+                )
+                content = read_content(response)
+                durations.append(time.perf_counter() - started)
+            if response.status_code != route.status:
+                raise RuntimeError(
+                    f'{route.label}: ответ {response.status_code},'
+                    f' ожидался {route.status}'
+                )
+            sizes.append(len(content))
+            queries.append(sum(map(len, captured)))
+        results[route.label] = describe(durations, sizes, queries)
+    return results
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def local_server():
+    """Многопоточный WSGI-сервер на свободном порту."""
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+    server.set_app(WSGIHandler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run_server(base_url, routes, clients, requests, concurrency):
+    routes = [route for route in routes if route.method == 'get']
+    cookies = {
+        user: '; '.join(
+            f'{name}={morsel.value}'
+            for name, morsel in client.cookies.items()
+        ) for user, client in clients.items()
+    }
+
+    def fetch(route):
+        request = urllib.request.Request(
+            base_url + route.url, headers={'Cookie': cookies[route.user]}
+        )
+        started = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            size = len(response.read())
+        return route, time.perf_counter() - started, size
+
+    durations = defaultdict(list)
+    sizes = defaultdict(list)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        jobs = (routes[number % len(routes)] for number in range(requests))
+        for route, duration, size in pool.map(fetch, jobs):
+            durations[route.label].append(duration)
+            sizes[route.label].append(size)
+    elapsed = time.perf_counter() - started
+    results = {
+        label: describe(durations[label], sizes[label])
+        for label in durations
+    }
+    results['_total'] = {
+        'requests': requests,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'rps': round(requests / elapsed, 1),
+    }
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Замер маршрутов blogicum.'
+    )
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument(
+        '--no-server', action='store_true',
+        help='Только тестовый клиент, без локального сервера.'
+    )
+    parser.add_argument(
+        '--with-cache', action='store_true',
+        help='Не отключать кэш страниц и карточек.'
+    )
+    parser.add_argument('--out', help='Файл отчёта; по умолчанию stdout.')
+    options = parser.parse_args()
+
+    report = {
+        'meta': {
+            'created': timezone.now().isoformat(),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'scale': options.scale,
+            'volumes': SCALES[options.scale].as_dict(),
+            'seed': options.seed,
+            'page_cache': options.with_cache,
+        },
+    }
+    with env.temporary_database():
+        overrides = {} if options.with_cache else env.no_page_caches()
+        with override_settings(**overrides):
+            started = time.perf_counter()
+            dataset = seed(SCALES[options.scale], options.seed)
+            report['meta']['seed_seconds'] = round(
+                time.perf_counter() - started, 1
+            )
+            routes = build_routes(dataset)
+            missing = missing_routes(routes)
+            if missing:
+                sys.exit(f'Нет замера для маршрутов: {", ".join(missing)}')
+            clients = make_clients(dataset)
+            report['client'] = run_client(routes, clients, options.repeat)
+            if not options.no_server:
+                with local_server() as base_url:
+                    report['server'] = run_server(
+                        base_url, routes, clients,
+                        options.requests, options.concurrency,
+                    )
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if options.out:
+        with open(options.out, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""Наполнение базы для замеров.
+
+Объёмы задаются `Scale`; генератор случайных чисел детерминирован, так
+что два запуска с одинаковыми параметрами дают одинаковые данные.
+Объекты создаются через bulk_create без сигналов, производные данные
+(счётчики, статистика, поисковый индекс, копии изображений) строятся в
+конце.
+"""
+import random
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import generate_variants
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+PASSWORD = 'benchmark'
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    categories: int
+    locations: int
+    posts: int
+    comments: int
+    images: int
+
+    def as_dict(self):
+        return asdict(self)
+
+
+SCALES = {
+    'tiny': Scale(
+        users=5, categories=2, locations=2, posts=30, comments=60, images=2
+    ),
+    'small': Scale(
+        users=50, categories=10, locations=20, posts=1000, comments=5000,
+        images=20
+    ),
+    'large': Scale(
+        users=2000, categories=50, locations=300, posts=100000,
+        comments=500000, images=200
+    ),
+}
+
+
+@dataclass
+class Dataset:
+    """Объекты, на которые ссылаются маршруты замера."""
+
+    author: object
+    reader: object
+    category: object
+    post: object
+    comment: object
+
+
+def comment_counts(posts, comments, rng):
+    """Число комментариев каждой публикации.
+
+    Распределение по закону Ципфа: немногие «вирусные» публикации
+    собирают большую часть обсуждения.
+    """
+    weights = [1 / rank ** 1.1 for rank in range(1, posts + 1)]
+    rng.shuffle(weights)
+    total = sum(weights)
+    return [round(comments * weight / total) for weight in weights]
+
+
+def make_image(rng, size=(1600, 1200)):
+    data = BytesIO()
+    color = tuple(rng.randrange(256) for _ in range(3))
+    Image.new('RGB', size, color).save(data, 'JPEG', quality=85)
+    return ContentFile(data.getvalue())
+
+
+def seed(scale, random_seed=0, batch_size=1000):
+    rng = random.Random(random_seed)
+    now = timezone.now()
+    password = make_password(PASSWORD)
+    User.objects.bulk_create((
+        User(username=f'user{number}', password=password)
+        for number in range(scale.users)
+    ), batch_size=batch_size)
+    users = list(User.objects.order_by('pk'))
+    Category.objects.bulk_create(
+        Category(
+            title=f'Категория {number}',
+            description=f'Описание категории {number}',
+            slug=f'category-{number}',
+        ) for number in range(scale.categories)
+    )
+    categories = list(Category.objects.order_by('pk'))
+    Location.objects.bulk_create(
+        Location(name=f'Место {number}') for number in range(scale.locations)
+    )
+    locations = list(Location.objects.order_by('pk'))
+
+    image_names = [
+        default_storage.save(
+            f'posts_images/bench{number}.jpg', make_image(rng)
+        ) for number in range(scale.images)
+    ]
+    Post.objects.bulk_create((
+        Post(
+            title=f'Публикация {number}',
+            text=' '.join(
+                rng.choice(('Марс', 'полёт', 'звёзды', 'станция', 'орбита'))
+                for _ in range(rng.randint(20, 200))
+            ),
+            pub_date=now - timedelta(minutes=number),
+            author=rng.choice(users),
+            category=rng.choice(categories),
+            location=rng.choice(locations + [None]),
+            image=image_names[number] if number < len(image_names) else '',
+        ) for number in range(scale.posts)
+    ), batch_size=batch_size)
+    for name in image_names:
+        generate_variants(name)
+
+    post_ids = list(Post.objects.order_by('pk').values_list('pk', flat=True))
+    counts = comment_counts(len(post_ids), scale.comments, rng)
+    Comment.objects.bulk_create((
+        Comment(post_id=post_id, author=rng.choice(users), text='Комментарий')
+        for post_id, count in zip(post_ids, counts)
+        for _ in range(count)
+    ), batch_size=batch_size)
+
+    for command in (
+        'recount_comments', 'recount_user_stats', 'rebuild_search_index'
+    ):
+        call_command(command, stdout=StringIO())
+
+    post = Post.objects.order_by('-comment_count', 'pk').first()
+    return Dataset(
+        author=post.author,
+        reader=User.objects.exclude(pk=post.author_id).first() or post.author,
+        category=post.category,
+        post=post,
+        comment=Comment.objects.create(
+            post=post, author=post.author, text='Комментарий автора'
+        ),
+    )
@@ -0,0 +1,125 @@
+"""Конкурентные записи и чтения SQLite: настройки по умолчанию и боевые.
+
+    python -m benchmarks.sqlite_concurrency --seconds 10 --writers 4
+
+Для каждого профиля создаётся своя временная база. Писатели в потоках
+публикуют комментарии через форму, читатели одновременно открывают
+ленту и страницы публикаций. Каждый запрос проходит полный цикл
+обработчика, поэтому при CONN_MAX_AGE = 0 подключение открывается
+заново на каждый запрос. Ответ 500 писателя — это «database is locked».
+Результат печатается в JSON.
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import env
+
+env.setup_django()
+
+from django.db import connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from benchmarks.run import describe  # noqa: E402
+from benchmarks.seed import SCALES, seed  # noqa: E402
+from blogicum import settings_production  # noqa: E402
+
+PROFILES = {
+    'default': {'pragmas': {}, 'conn_max_age': 0},
+    'production': {
+        'pragmas': settings_production.SQLITE_PRAGMAS,
+        'conn_max_age': settings_production.CONN_MAX_AGE,
+    },
+}
+
+
+def write_comments(dataset, deadline):
+    client = Client(raise_request_exception=False)
+    client.force_login(dataset.reader)
+    url = f'/posts/{dataset.post.pk}/comment/'
+    written = failed = 0
+    while time.perf_counter() < deadline:
+        response = client.post(url, {'text': 'Комментарий из замера'})
+        if response.status_code == 302:
+            written += 1
+        else:
+            failed += 1
+    return written, failed
+
+
+def read_pages(urls, deadline):
+    client = Client(raise_request_exception=False)
+    durations = []
+    errors = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = client.get(urls[len(durations) % len(urls)])
+        durations.append(time.perf_counter() - started)
+        errors += response.status_code != 200
+    return durations, errors
+
+
+def run_profile(profile, scale, seconds, writers, readers):
+    with env.temporary_database():
+        # Словари настроек общие для подключений всех потоков.
+        for connection in connections.all():
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = profile['conn_max_age']
+        with override_settings(
+            SQLITE_PRAGMAS=profile['pragmas'], **env.no_page_caches()
+        ):
+            dataset = seed(scale)
+            urls = ['/', f'/posts/{dataset.post.pk}/']
+            deadline = time.perf_counter() + seconds
+            with ThreadPoolExecutor(writers + readers) as pool:
+                writes = [
+                    pool.submit(write_comments, dataset, deadline)
+                    for _ in range(writers)
+                ]
+                reads = [
+                    pool.submit(read_pages, urls, deadline)
+                    for _ in range(readers)
+                ]
+                writes = [future.result() for future in writes]
+                reads = [future.result() for future in reads]
+        for connection in connections.all():
+            connection.close()
+    written = sum(written for written, _ in writes)
+    durations = [duration for chunk, _ in reads for duration in chunk]
+    return {
+        'writes': written,
+        'writes_per_sec': round(written / seconds, 1),
+        'locked_errors': sum(failed for _, failed in writes),
+        'reads': describe(durations) if durations else {},
+        'read_errors': sum(errors for _, errors in reads),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Конкурентная нагрузка на SQLite с разными настройками.'
+    )
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument(
+        '--profile', choices=PROFILES, action='append',
+        help='Профиль настроек; по умолчанию все.'
+    )
+    options = parser.parse_args()
+
+    result = {
+        name: run_profile(
+            PROFILES[name], SCALES[options.scale], options.seconds,
+            options.writers, options.readers,
+        )
+        for name in options.profile or PROFILES
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,71 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.admin.widgets import ForeignKeyRawIdWidget
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
 from django.utils.html import format_html
 
-from .models import Category, Comment, Location, Post
+from . import search
+from .admin_filters import AuthorFilter, LocationFilter
+from .bulk import update_categories, update_posts
+from .images import variant_url
+from .models import Category, Comment, ImageJob, Location, Post
+from .paginators import EstimatedCountPaginator
+
+
+def log_bulk_change(request, model, ids, message):
+    """Одна запись в журнале админки на всё массовое действие."""
+    LogEntry.objects.create(
+        user_id=request.user.pk,
+        content_type=ContentType.objects.get_for_model(model),
+        object_repr=f'{model._meta.verbose_name_plural}: {len(ids)}',
+        action_flag=CHANGE,
+        change_message=f'{message}; id: {", ".join(map(str, ids))}',
+    )
+
+
+class BulkActionsMixin:
+    """Действия админки, меняющие выборку одним UPDATE."""
+
+    bulk_update = None
+
+    def apply_bulk_update(self, request, queryset, message, **values):
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+        updated = self.bulk_update(ids, **values)
+        log_bulk_change(request, self.model, ids, message)
+        self.message_user(
+            request, f'{message}: {updated}.', messages.SUCCESS
+        )
+
+
+def raw_id_choice(field, label):
+    """Поле выбора по id: список всех строк на странице не выводится."""
+    remote_field = Post._meta.get_field(field).remote_field
+    return forms.ModelChoiceField(
+        remote_field.model.objects.all(),
+        required=False,
+        label=label,
+        widget=ForeignKeyRawIdWidget(remote_field, admin.site),
+    )
+
+
+class PostActionForm(ActionForm):
+    category = raw_id_choice('category', 'Категория')
+    location = raw_id_choice('location', 'Местоположение')
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(BulkActionsMixin, admin.ModelAdmin):
+    action_form = PostActionForm
+    actions = (
+        'publish',
+        'unpublish',
+        'move_to_category',
+        'reassign_location',
+    )
+    bulk_update = staticmethod(update_posts)
     list_display = (
         'title',
         'category',
@@ -16,15 +76,19 @@ class PostAdmin(admin.ModelAdmin):
         'display_image'
     )
     list_editable = ('is_published',)
+    list_select_related = ('category', 'author', 'location')
     search_fields = ('title',)
     list_filter = (
         'is_published',
         'pub_date',
         'category',
-        'author',
-        'location',
+        AuthorFilter,
+        LocationFilter,
     )
     list_display_links = ('title',)
+    autocomplete_fields = ('author', 'location', 'category')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     fieldsets = (
         ('Основная информация', {
             'fields': (
@@ -44,19 +108,75 @@ class PostAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not search.is_available():
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        if not search.match_expression(search_term):
+            # В запросе нет слов, а пустой MATCH — ошибка FTS5.
+            return queryset.none(), False
+        return queryset.filter(pk__in=search.matching_ids(search_term)), False
+
     def display_image(self, obj):
         if obj.image:
             return format_html(
                 '<img src="{}" width="50" height="50" />',
-                obj.image.url
+                variant_url(obj.image.name, 'admin') or obj.image.url
             )
         return "Нет изображения!"
 
     display_image.short_description = 'Изображение'
 
+    @admin.action(description='Опубликовать выбранные публикации')
+    def publish(self, request, queryset):
+        self.apply_bulk_update(
+            request, queryset, 'Опубликовано', is_published=True
+        )
+
+    @admin.action(description='Снять с публикации выбранные публикации')
+    def unpublish(self, request, queryset):
+        self.apply_bulk_update(
+            request, queryset, 'Снято с публикации', is_published=False
+        )
+
+    @admin.action(description='Перенести в категорию')
+    def move_to_category(self, request, queryset):
+        category = self.chosen(request, 'category')
+        if category is not None:
+            self.apply_bulk_update(
+                request, queryset, f'Перенесено в категорию «{category}»',
+                category=category
+            )
+
+    @admin.action(description='Изменить местоположение')
+    def reassign_location(self, request, queryset):
+        location = self.chosen(request, 'location')
+        if location is not None:
+            self.apply_bulk_update(
+                request, queryset, f'Местоположение изменено на «{location}»',
+                location=location
+            )
+
+    def chosen(self, request, field):
+        form_field = self.action_form.base_fields[field]
+        try:
+            value = form_field.clean(request.POST.get(field))
+        except ValidationError:
+            value = None
+        if value is None:
+            self.message_user(
+                request,
+                f'Выберите «{form_field.label}» рядом с действием.',
+                messages.ERROR,
+            )
+        return value
+
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(BulkActionsMixin, admin.ModelAdmin):
+    actions = ('publish', 'unpublish')
+    bulk_update = staticmethod(update_categories)
     list_display = (
         'title',
         'is_published'
@@ -66,6 +186,37 @@ class CategoryAdmin(admin.ModelAdmin):
     list_filter = ('is_published',)
     list_display_links = ('title',)
 
+    @admin.action(description='Опубликовать выбранные категории')
+    def publish(self, request, queryset):
+        self.apply_bulk_update(
+            request, queryset, 'Опубликовано', is_published=True
+        )
+
+    @admin.action(description='Снять с публикации выбранные категории')
+    def unpublish(self, request, queryset):
+        self.apply_bulk_update(
+            request, queryset, 'Снято с публикации', is_published=False
+        )
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'image', 'post', 'status', 'attempts', 'created_at', 'started_at'
+    )
+    list_filter = ('status',)
+    list_select_related = ('post',)
+    readonly_fields = (
+        'post', 'image', 'attempts', 'error', 'created_at', 'started_at'
+    )
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    search_fields = ('name',)
+
 
-admin.site.register(Location)
-admin.site.register(Comment)
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_select_related = ('post', 'author')
+    raw_id_fields = ('post',)
@@ -0,0 +1,43 @@
+"""Фильтры списка объектов в админке без перечисления всех вариантов.
+
+Стандартный фильтр по внешнему ключу выводит ссылку на каждую строку
+связанной таблицы. Эти фильтры показывают одно текстовое поле.
+"""
+from django.contrib import admin
+
+
+class InputFilter(admin.SimpleListFilter):
+    template = 'admin/blog/input_filter.html'
+    lookup = None
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.lookup: self.value().strip()})
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            'query_parts': [
+                (name, value) for name, value in changelist.params.items()
+                if name not in (self.parameter_name, 'p')
+            ],
+            'value': self.value() or '',
+        }
+
+
+class AuthorFilter(InputFilter):
+    title = 'автору (имя пользователя)'
+    parameter_name = 'author'
+    lookup = 'author__username'
+
+
+class LocationFilter(InputFilter):
+    title = 'местоположению'
+    parameter_name = 'location'
+    lookup = 'location__name__icontains'
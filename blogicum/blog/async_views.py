@@ -0,0 +1,57 @@
+"""Асинхронные представления страниц только для чтения (режим ASGI).
+
+ORM в Django 3.2 синхронный, поэтому каждое представление делает ровно
+один переход в пул потоков: там выполняются запросы и рендер шаблона.
+Обычное синхронное представление под ASGI в Django 3.2 исполняется в
+единственном общем потоке, то есть запросы идут строго по очереди;
+здесь же они обрабатываются параллельно, а медленные клиенты получают
+ответ из цикла событий, не занимая поток.
+
+Потоковая отдача (`STREAMING_RESPONSES`) в этом режиме отключена:
+генератор ответа ASGI-обработчик читал бы в цикле событий, где ORM
+недоступен.
+"""
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.views.generic.base import TemplateView
+
+from blog.views import (
+    CategoryPostsView,
+    IndexView,
+    PostCommentsView,
+    PostDetailView,
+    UserProfileView
+)
+
+
+def _render(view, request, *args, **kwargs):
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+    finally:
+        # Соединение открыто в потоке пула, а не в потоке запроса, и
+        # сигнал request_finished его не закроет.
+        close_old_connections()
+
+
+def as_async(view_class, **initkwargs):
+    view = view_class.as_view(**initkwargs)
+
+    async def async_view(request, *args, **kwargs):
+        return await sync_to_async(_render, thread_sensitive=False)(
+            view, request, *args, **kwargs
+        )
+
+    async_view.view_class = view_class
+    return async_view
+
+
+index = as_async(IndexView, streaming=False)
+category_posts = as_async(CategoryPostsView, streaming=False)
+profile = as_async(UserProfileView, streaming=False)
+post_detail = as_async(PostDetailView, streaming=False)
+post_comments = as_async(PostCommentsView, streaming=False)
+about = as_async(TemplateView, template_name='pages/about.html')
+rules = as_async(TemplateView, template_name='pages/rules.html')
@@ -0,0 +1,51 @@
+"""Массовые изменения публикаций и категорий одним UPDATE.
+
+`QuerySet.update()` не вызывает сигналы моделей, поэтому сброс версий,
+лент и запись в журнал изменений выполняются здесь — по одному разу на
+всю выборку, а не на каждый объект.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from blog import changelog, registry
+from blog.cache import bump_feeds, bump_versions, post_feeds
+from blog.models import Category, ChangeLog, Post
+from blog.schedule import reset_next_publication
+from blog.stats import recount_stats
+
+User = get_user_model()
+
+
+def update_posts(post_ids, **values):
+    """Обновляет публикации; возвращает число изменённых строк."""
+    posts = Post.objects.filter(pk__in=post_ids)
+    with transaction.atomic():
+        feeds = post_feeds(posts)
+        updated = posts.update(updated_at=timezone.now(), **values)
+        feeds |= post_feeds(posts)
+        changelog.record(ChangeLog.POST, *post_ids)
+        if 'is_published' in values:
+            recount_stats(User.objects.filter(
+                pk__in=posts.values('author_id')
+            ))
+    reset_next_publication()
+    bump_versions(*(f'post:{post_id}' for post_id in post_ids))
+    bump_feeds(feeds)
+    return updated
+
+
+def update_categories(category_ids, **values):
+    """Обновляет категории; публикации переиндексирует журнал изменений."""
+    categories = Category.objects.filter(pk__in=category_ids)
+    with transaction.atomic():
+        slugs = set(categories.values_list('slug', flat=True))
+        updated = categories.update(updated_at=timezone.now(), **values)
+        slugs |= set(categories.values_list('slug', flat=True))
+        changelog.record(ChangeLog.CATEGORY, *category_ids)
+    bump_versions(
+        registry.VERSION,
+        *(f'category:{category_id}' for category_id in category_ids)
+    )
+    bump_feeds({(slug, None) for slug in slugs})
+    return updated
@@ -0,0 +1,89 @@
+"""Версии данных для ключей кэша.
+
+Вместо удаления закэшированных фрагментов меняется версия объекта,
+от которой зависит ключ: старые записи просто перестают запрашиваться
+и вытесняются бэкендом кэша.
+
+Версии хранятся в кэше `SHARED_CACHE_ALIAS`, и он обязан быть общим для
+всех процессов: сбросы делают и веб-процессы, и `apply_changes`, и
+`process_image_jobs`. В кэше памяти процесса сброс из одного процесса
+не увидели бы остальные, и они отдавали бы устаревшие страницы.
+"""
+import time
+import uuid
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def shared_cache():
+    return caches[settings.SHARED_CACHE_ALIAS]
+
+
+def _version_key(name):
+    return f'version:{name}'
+
+
+def new_version():
+    return f'{time.time_ns():x}.{uuid.uuid4().hex[:8]}'
+
+
+def version_time(version):
+    """Момент, когда была выдана версия."""
+    nanoseconds = int(version.split('.')[0], 16)
+    return datetime.fromtimestamp(nanoseconds / 10**9, tz=timezone.utc)
+
+
+def get_versions(*names):
+    """Возвращает версии в порядке имён, создавая отсутствующие."""
+    cache = shared_cache()
+    keys = [_version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*names):
+    shared_cache().set_many(
+        {_version_key(name): new_version() for name in names}, None
+    )
+
+
+def post_card_versions(post):
+    return get_versions(
+        f'post:{post.pk}',
+        f'category:{post.category_id}',
+        f'location:{post.location_id}',
+        f'user:{post.author_id}',
+    )
+
+
+def feed_scope(category_slug=None, author_id=None):
+    """Имя версии ленты: главной, категории или профиля."""
+    if category_slug is not None:
+        return f'category-feed:{category_slug}'
+    if author_id is not None:
+        return f'author-feed:{author_id}'
+    return 'feed'
+
+
+def bump_feeds(feeds):
+    """Сбрасывает главную ленту и ленты пар (slug категории, id автора)."""
+    scopes = {feed_scope()}
+    for category_slug, author_id in feeds:
+        if category_slug is not None:
+            scopes.add(feed_scope(category_slug=category_slug))
+        if author_id is not None:
+            scopes.add(feed_scope(author_id=author_id))
+    bump_versions(*scopes)
+
+
+def post_feeds(posts):
+    """Пары (slug категории, id автора) для лент с публикациями."""
+    return set(
+        posts.order_by().values_list('category__slug', 'author_id').distinct()
+    )
@@ -0,0 +1,29 @@
+"""Бэкенды кэша.
+
+`FileBasedCache` Django перед каждой записью перечисляет весь каталог
+кэша, чтобы решить, не пора ли удалить часть записей. Для общего кэша
+версий, где запись — каждый сброс, это делает запись тем дороже, чем
+больше публикаций.
+"""
+import random
+
+from django.core.cache.backends import filebased
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """Файловый кэш, который проверяет переполнение лишь изредка.
+
+    Каталог перечисляется в среднем раз на `CULL_EVERY` записей
+    (параметр OPTIONS, по умолчанию 1000), поэтому запись стоит O(1), а
+    записей может оказаться больше MAX_ENTRIES не более чем на столько
+    же порядка.
+    """
+
+    def __init__(self, dir, params):
+        options = dict(params.get('OPTIONS') or {})
+        self._cull_every = int(options.pop('CULL_EVERY', 1000))
+        super().__init__(dir, {**params, 'OPTIONS': options})
+
+    def _cull(self):
+        if random.random() * self._cull_every < 1:
+            super()._cull()
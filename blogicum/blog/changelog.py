@@ -0,0 +1,109 @@
+"""Журнал изменений и его обработка пакетами.
+
+Сигналы синхронно делают только работу O(1): сбрасывают версии самого
+объекта и главной ленты. Всё, что зависит от числа связанных публикаций
+(переиндексация категории, сброс лент авторов, пересчёт счётчиков),
+выполняет `apply_pending` порциями фиксированного размера. Повторное
+применение записи даёт тот же результат, поэтому обработку можно
+прерывать и запускать снова.
+
+Версии кэша сбрасываются после фиксации транзакции: сброшенная раньше
+версия дала бы веб-процессам закэшировать под ней ещё старые данные.
+"""
+from django.db import transaction
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from blog.cache import bump_feeds, bump_versions, post_feeds
+from blog.models import ChangeLog, Comment, Post
+from blog.search import index_posts, remove_posts
+
+
+def record(kind, *object_ids):
+    ChangeLog.objects.bulk_create(
+        ChangeLog(kind=kind, object_id=object_id)
+        for object_id in object_ids if object_id is not None
+    )
+
+
+def record_posts(posts, batch_size=1000):
+    ids = posts.order_by().values_list('pk', flat=True)
+    ChangeLog.objects.bulk_create(
+        (ChangeLog(kind=ChangeLog.POST, object_id=pk)
+         for pk in ids.iterator()),
+        batch_size=batch_size,
+    )
+
+
+def lag():
+    """Число необработанных записей и возраст самой старой."""
+    stats = ChangeLog.objects.aggregate(
+        pending=Count('pk'), oldest=Min('created_at')
+    )
+    age = timezone.now() - stats['oldest'] if stats['oldest'] else None
+    return stats['pending'], age
+
+
+def refresh_posts(post_ids):
+    """Переиндексирует публикации; возвращает их ленты для сброса."""
+    existing = Post.objects.filter(pk__in=post_ids)
+    index_posts(existing)
+    remove_posts(set(post_ids) - set(existing.values_list('pk', flat=True)))
+    return post_feeds(existing)
+
+
+def recount_comments(post_ids):
+    """Пересчитывает счётчики; возвращает ленты публикаций для сброса."""
+    comments = Comment.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(total=Count('pk')).values('total')
+    Post.objects.filter(pk__in=post_ids).update(
+        comment_count=Coalesce(Subquery(comments), 0)
+    )
+    return post_feeds(Post.objects.filter(pk__in=post_ids))
+
+
+def refresh_related_posts(field, object_id, batch_size):
+    """Обходит публикации категории или места порциями по id."""
+    last_pk = 0
+    while True:
+        post_ids = list(
+            Post.objects.filter(
+                **{field: object_id}, pk__gt=last_pk
+            ).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not post_ids:
+            return
+        with transaction.atomic():
+            feeds = refresh_posts(post_ids)
+        bump_feeds(feeds)
+        last_pk = post_ids[-1]
+
+
+def apply_pending(batch_size=500):
+    """Применяет до `batch_size` записей журнала; возвращает их число."""
+    entries = list(ChangeLog.objects.all()[:batch_size])
+    if not entries:
+        return 0
+    ids = {kind: set() for kind, _ in ChangeLog.KINDS}
+    for entry in entries:
+        ids[entry.kind].add(entry.object_id)
+    feeds = set()
+    with transaction.atomic():
+        if ids[ChangeLog.POST]:
+            feeds |= refresh_posts(ids[ChangeLog.POST])
+        if ids[ChangeLog.POST_COMMENTS]:
+            feeds |= recount_comments(ids[ChangeLog.POST_COMMENTS])
+    if ids[ChangeLog.POST_COMMENTS]:
+        bump_versions(
+            *(f'post:{post_id}' for post_id in ids[ChangeLog.POST_COMMENTS])
+        )
+    if ids[ChangeLog.POST] or ids[ChangeLog.POST_COMMENTS]:
+        bump_feeds(feeds)
+    for category_id in ids[ChangeLog.CATEGORY]:
+        refresh_related_posts('category', category_id, batch_size)
+    for location_id in ids[ChangeLog.LOCATION]:
+        refresh_related_posts('location', location_id, batch_size)
+    ChangeLog.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+    return len(entries)
@@ -0,0 +1,72 @@
+"""Подключения к базе: реплики для чтения и настройка SQLite.
+
+Страницы из `REPLICA_READ_VIEWS` на GET и HEAD читают с одной из реплик
+`DATABASE_REPLICAS`; всё остальное — записи, формы, админка — идёт в
+основную базу. Реплику на время запроса выбирает
+`ReplicaRoutingMiddleware`, роутер лишь читает этот выбор.
+
+Каждое новое подключение SQLite получает PRAGMA из `SQLITE_PRAGMAS`.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Сессии и пользователи всегда читаются с основной базы: иначе отставание
+# реплики разлогинивает только что вошедшего пользователя.
+PRIMARY_ONLY_APPS = {'sessions', 'auth'}
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def choose_replica():
+    replicas = settings.DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else None
+
+
+def route_reads(alias):
+    """Направляет чтения текущего контекста в `alias` (None — основная)."""
+    _read_alias.set(alias)
+
+
+@contextmanager
+def reading_from(alias):
+    """Направляет чтения внутри блока в базу `alias`."""
+    previous = _read_alias.get()
+    route_reads(alias)
+    try:
+        yield
+    finally:
+        route_reads(previous)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплики получают схему через репликацию основной базы.
+        return db not in settings.DATABASE_REPLICAS
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
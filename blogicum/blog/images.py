@@ -0,0 +1,175 @@
+"""Уменьшенные копии изображений публикаций.
+
+Копии лежат в отдельном каталоге `variants/` и сохраняют полное имя
+оригинала: `variants/posts_images/cat.jpg.card.jpg` и
+`variants/posts_images/cat.jpg.card.webp`. Так копии разных файлов не
+совпадают между собой и с загрузками пользователей, и удаляются только
+файлы, созданные здесь. Копия для браузеров без WebP остаётся в формате
+оригинала, у WebP она совпадает с WebP-копией. Наличие копии кэшируется,
+чтобы списки публикаций не обращались к хранилищу для каждой картинки;
+кэш общий, потому что копии создаёт отдельный процесс
+`process_image_jobs`.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from blog.cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+VARIANTS = {
+    'admin': {'size': (50, 50), 'crop': True},
+    'card': {'size': (640, None), 'crop': False},
+    'detail': {'size': (1280, None), 'crop': False},
+}
+WEBP = 'webp'
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+# Отсутствующую копию может создать другой процесс, поэтому промах
+# кэшируется ненадолго.
+URL_CACHE_TIMEOUT = 60 * 60 * 24
+MISSING_CACHE_TIMEOUT = 60
+MISSING = ''
+VARIANTS_DIR = 'variants'
+
+
+# Форматы, в которых копия сохраняет формат оригинала, и расширения копий.
+SOURCE_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': WEBP}
+
+
+def _source_format(name):
+    """Формат копий по расширению оригинала; прочие сохраняются в PNG."""
+    extension = os.path.splitext(name)[1].lower()
+    image_format = Image.registered_extensions().get(extension)
+    if image_format not in SOURCE_FORMATS:
+        image_format = 'PNG'
+    return image_format, SOURCE_FORMATS[image_format]
+
+
+def variant_name(name, variant, webp=False):
+    extension = WEBP if webp else _source_format(name)[1]
+    return f'{VARIANTS_DIR}/{name}.{variant}.{extension}'
+
+
+def _url_key(target):
+    return f'image_variant:{target}'
+
+
+def forget_variants(name):
+    shared_cache().delete_many(
+        [_url_key(target) for target in variant_names(name)]
+    )
+
+
+def variant_names(name):
+    return list(dict.fromkeys(
+        variant_name(name, variant, webp)
+        for variant in VARIANTS
+        for webp in (False, True)
+    ))
+
+
+def _resize(image, size, crop):
+    width, height = size
+    if crop:
+        if image.width <= width and image.height <= height:
+            return None
+        return ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+    if image.width <= width:
+        return None
+    height = round(image.height * width / image.width)
+    return image.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def _encode(image, image_format):
+    buffer = BytesIO()
+    if image_format == 'JPEG':
+        image.convert('RGB').save(
+            buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True
+        )
+    elif image_format == 'WEBP':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(buffer, image_format, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def _save(storage, name, content):
+    """Перезаписывает файл: storage.save сам выбрал бы свободное имя."""
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, content)
+
+
+def strip_metadata(name, storage=default_storage):
+    """Поворачивает оригинал по EXIF и перекодирует его без метаданных.
+
+    Возвращает False, если в файле не было метаданных и он не изменён.
+    """
+    with storage.open(name) as source:
+        image = Image.open(source)
+        image.load()
+    if 'exif' not in image.info:
+        return False
+    # Снимки с телефонов Pillow опознаёт как MPO — это JPEG с превью.
+    image_format = 'JPEG' if image.format == 'MPO' else image.format
+    image = ImageOps.exif_transpose(image)
+    image.info.pop('exif', None)
+    _save(storage, name, _encode(image, image_format))
+    return True
+
+
+def generate_variants(name, storage=default_storage):
+    """Создаёт копии изображения; возвращает имена созданных файлов."""
+    try:
+        with storage.open(name) as source:
+            image = ImageOps.exif_transpose(Image.open(source))
+            image.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning('Не удалось открыть изображение %s', name)
+        return []
+    if image.mode not in ('RGB', 'RGBA'):
+        mode = 'RGBA' if 'transparency' in image.info else 'RGB'
+        image = image.convert(mode)
+    image_format = _source_format(name)[0]
+    created = []
+    for variant, options in VARIANTS.items():
+        resized = _resize(image, options['size'], options['crop'])
+        if resized is None:
+            continue
+        for webp in (False, True):
+            target = variant_name(name, variant, webp)
+            if target in created:
+                continue
+            _save(
+                storage, target,
+                _encode(resized, 'WEBP' if webp else image_format)
+            )
+            created.append(target)
+    forget_variants(name)
+    return created
+
+
+def delete_variants(name, storage=default_storage):
+    for target in variant_names(name):
+        if storage.exists(target):
+            storage.delete(target)
+    forget_variants(name)
+
+
+def variant_url(name, variant, webp=False, storage=default_storage):
+    """URL копии или None, если она ещё не создана."""
+    target = variant_name(name, variant, webp)
+    url = shared_cache().get(_url_key(target))
+    if url is None:
+        url = storage.url(target) if storage.exists(target) else MISSING
+        shared_cache().set(
+            _url_key(target), url,
+            URL_CACHE_TIMEOUT if url else MISSING_CACHE_TIMEOUT
+        )
+    return url or None
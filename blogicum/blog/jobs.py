@@ -0,0 +1,86 @@
+"""Очередь обработки изображений в базе данных.
+
+Запрос на сохранение публикации только ставит задачу; копии создаёт
+команда `process_image_jobs`, запущенная отдельным процессом. Пока задача
+не выполнена, шаблоны показывают оригинал. Задача, которую обработчик
+взял и не завершил за `RUNNING_TIMEOUT` (процесс упал или был убит),
+возвращается в очередь.
+"""
+import logging
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from blog.cache import bump_feeds, bump_versions, post_feeds
+from blog.images import generate_variants, strip_metadata
+from blog.models import ImageJob, Post
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+RUNNING_TIMEOUT = timedelta(minutes=10)
+
+
+def enqueue_image_job(post):
+    ImageJob.objects.filter(post=post, status=ImageJob.PENDING).delete()
+    return ImageJob.objects.create(post=post, image=post.image.name)
+
+
+def claim(job):
+    """Забирает задачу; False, если её уже взял другой обработчик."""
+    return ImageJob.objects.filter(
+        pk=job.pk, status=ImageJob.PENDING
+    ).update(
+        status=ImageJob.RUNNING,
+        attempts=F('attempts') + 1,
+        started_at=timezone.now(),
+    ) == 1
+
+
+def reclaim_stale():
+    """Возвращает в очередь зависшие задачи; возвращает их количество."""
+    stale = ImageJob.objects.filter(
+        status=ImageJob.RUNNING,
+        started_at__lt=timezone.now() - RUNNING_TIMEOUT,
+    )
+    error = 'Обработчик не завершил задачу вовремя.'
+    return stale.filter(attempts__lt=MAX_ATTEMPTS).update(
+        status=ImageJob.PENDING, error=error
+    ) + stale.update(status=ImageJob.FAILED, error=error)
+
+
+def run_job(job):
+    current_image = Post.objects.filter(
+        pk=job.post_id
+    ).values_list('image', flat=True).first()
+    if current_image == job.image:
+        strip_metadata(job.image)
+        generate_variants(job.image)
+        bump_versions(f'post:{job.post_id}')
+        bump_feeds(post_feeds(Post.objects.filter(pk=job.post_id)))
+    job.status = ImageJob.DONE
+    job.error = ''
+    job.save(update_fields=('status', 'error'))
+
+
+def process_pending(limit=10):
+    """Выполняет до `limit` задач из очереди; возвращает их количество."""
+    reclaim_stale()
+    processed = 0
+    for job in ImageJob.objects.filter(status=ImageJob.PENDING)[:limit]:
+        if not claim(job):
+            continue
+        job.refresh_from_db()
+        try:
+            run_job(job)
+        except Exception as error:
+            logger.exception('Ошибка обработки изображения %s', job.image)
+            job.status = (
+                ImageJob.PENDING if job.attempts < MAX_ATTEMPTS
+                else ImageJob.FAILED
+            )
+            job.error = str(error)
+            job.save(update_fields=('status', 'error'))
+        processed += 1
+    return processed
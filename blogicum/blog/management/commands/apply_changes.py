@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.changelog import apply_pending, lag
+
+
+class Command(BaseCommand):
+    help = (
+        'Применяет журнал изменений к поисковому индексу, счётчикам и кэшам'
+        ' лент.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--lag', action='store_true',
+            help='Только показать размер и возраст очереди.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, ждать новых записей.'
+        )
+        parser.add_argument('--sleep', type=float, default=2)
+
+    def report_lag(self):
+        pending, age = lag()
+        age = f'{age.total_seconds():.1f} с' if age is not None else '—'
+        self.stdout.write(
+            f'В очереди: {pending}, самой старой записи: {age}'
+        )
+
+    def handle(self, *args, **options):
+        self.report_lag()
+        if options['lag']:
+            return
+        while True:
+            applied = apply_pending(options['batch_size'])
+            if applied:
+                self.stdout.write(f'Применено записей: {applied}')
+                self.report_lag()
+            elif options['loop']:
+                time.sleep(options['sleep'])
+            else:
+                return
@@ -0,0 +1,40 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.transfer import export_records, summary, write_csv, write_jsonl
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает пользователей, категории, местоположения,'
+        ' публикации и комментарии в JSON lines или CSV.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Файл JSON lines, «-» для stdout или каталог для CSV.'
+        )
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'), default='jsonl'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        records = export_records(options['batch_size'])
+        started = time.perf_counter()
+        if options['format'] == 'csv':
+            counts = write_csv(records, path)
+        elif path == '-':
+            counts = write_jsonl(records, sys.stdout)
+        else:
+            with open(path, 'w', encoding='utf-8') as stream:
+                counts = write_jsonl(records, stream)
+        # Сводка не должна смешиваться с выгрузкой в stdout.
+        report = self.stderr if path == '-' else self.stdout
+        report.write(self.style.SUCCESS(
+            summary('Выгружено', counts, time.perf_counter() - started)
+        ))
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog import registry, search
+from blog.cache import bump_versions
+from blog.schedule import reset_next_publication
+from blog.transfer import (
+    Importer,
+    TransferError,
+    explicit_timestamps,
+    read_csv,
+    read_jsonl,
+    summary
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает выгрузку export_blog пачками bulk_create в'
+        ' одной транзакции и затем пересчитывает счётчики, статистику,'
+        ' индекс и кэши. После ошибки база не меняется, и команду можно'
+        ' запустить снова.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Файл JSON lines, «-» для stdin или каталог с CSV.'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--no-rebuild', action='store_true',
+            help=(
+                'Не пересчитывать производные данные: удобно, когда архив'
+                ' загружается несколькими файлами подряд.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        importer = Importer(options['batch_size'])
+        started = time.perf_counter()
+        try:
+            with explicit_timestamps(), transaction.atomic():
+                if os.path.isdir(path):
+                    self.load(importer, read_csv(path))
+                elif path == '-':
+                    self.load(importer, read_jsonl(sys.stdin))
+                else:
+                    with open(path, encoding='utf-8') as stream:
+                        self.load(importer, read_jsonl(stream))
+        except TransferError as error:
+            raise CommandError(
+                f'{error} Загрузка отменена, до ошибки обработано:'
+                f' {importer.counts}'
+            )
+        importer.invalidate()
+        seconds = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            summary('Загружено', importer.counts, seconds)
+        ))
+        if not options['no_rebuild']:
+            self.rebuild(options['batch_size'])
+
+    def load(self, importer, records):
+        for model, fields in records:
+            importer.add(model, fields)
+        importer.finish()
+
+    def rebuild(self, batch_size):
+        started = time.perf_counter()
+        options = {'stdout': self.stdout, 'verbosity': 0}
+        call_command('recount_comments', **options)
+        call_command('recount_user_stats', batch_size=batch_size, **options)
+        if search.is_available():
+            call_command('rebuild_search_index', **options)
+        call_command('apply_changes', batch_size=batch_size, **options)
+        bump_versions(registry.VERSION)
+        reset_next_publication()
+        self.stdout.write(
+            f'Производные данные пересчитаны за'
+            f' {time.perf_counter() - started:.1f} с'
+        )
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.jobs import process_pending
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать очередь один раз и выйти.'
+        )
+        parser.add_argument('--batch-size', type=int, default=10)
+        parser.add_argument(
+            '--sleep', type=float, default=2,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_pending(options['batch_size'])
+            if processed:
+                self.stdout.write(f'Обработано задач: {processed}')
+            elif options['once']:
+                return
+            else:
+                time.sleep(options['sleep'])
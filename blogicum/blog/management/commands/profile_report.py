@@ -0,0 +1,97 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+COLUMNS = (
+    ('view', 'Представление', 40),
+    ('count', 'Запросов', 9),
+    ('p50', 'p50, мс', 9),
+    ('p95', 'p95, мс', 9),
+    ('p99', 'p99, мс', 9),
+    ('sql_count', 'SQL, шт', 8),
+    ('sql_p95', 'SQL p95', 9),
+    ('render_p95', 'Рендер p95', 11),
+)
+
+
+def percentile(values, percent):
+    """Процентиль по ближайшему рангу; None для пустого списка."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def aggregate(records):
+    """Сводка по представлениям из записей журнала профилирования."""
+    groups = defaultdict(list)
+    for record in records:
+        groups[record.get('view') or '—'].append(record)
+    rows = []
+    for view, items in groups.items():
+        total = [item['total_ms'] for item in items]
+        rows.append({
+            'view': view,
+            'count': len(items),
+            'p50': percentile(total, 50),
+            'p95': percentile(total, 95),
+            'p99': percentile(total, 99),
+            'sql_count': round(
+                sum(item['sql_count'] for item in items) / len(items), 1
+            ),
+            'sql_p95': percentile([item['sql_ms'] for item in items], 95),
+            'render_p95': percentile([
+                item['render_ms'] for item in items
+                if item.get('render_ms') is not None
+            ], 95),
+        })
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Сводит журнал профилирования в таблицу по представлениям.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'log', nargs='?',
+            help='Файл JSON lines; по умолчанию PROFILING_LOG_FILE.'
+        )
+        parser.add_argument(
+            '--sort', default='p95',
+            choices=[name for name, _, _ in COLUMNS],
+        )
+        parser.add_argument('--limit', type=int, default=20)
+
+    def read(self, path):
+        try:
+            with open(path, encoding='utf-8') as log:
+                for number, line in enumerate(log, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        self.stderr.write(f'Строка {number} пропущена.')
+        except FileNotFoundError:
+            raise CommandError(f'Нет файла журнала {path}.')
+
+    def handle(self, *args, **options):
+        rows = aggregate(
+            self.read(options['log'] or settings.PROFILING_LOG_FILE)
+        )
+        sort = options['sort']
+        rows.sort(
+            key=lambda row: (row[sort] is not None, row[sort]),
+            reverse=sort != 'view',
+        )
+        self.stdout.write(' '.join(
+            title.ljust(width) for _, title, width in COLUMNS
+        ))
+        for row in rows[:options['limit']]:
+            self.stdout.write(' '.join(
+                str('—' if row[name] is None else row[name]).ljust(width)
+                for name, _, width in COLUMNS
+            ))
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+from blog import nplusone
+from blog.db import choose_replica, reading_from
+
+logger = logging.getLogger(__name__)
+
+_log_lock = threading.Lock()
+
+
+class QueryTimer:
+    """Обёртка execute_wrapper: считает запросы к базе и их время."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+def write_profile(record, path=None):
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    with _log_lock:
+        with open(path or settings.PROFILING_LOG_FILE, 'a',
+                  encoding='utf-8') as log:
+            log.write(line)
+
+
+class ProfilingMiddleware:
+    """Пишет в JSON lines время запроса, SQL и рендера шаблона.
+
+    В журнал попадает доля запросов `PROFILING_SAMPLE_RATE` и все
+    запросы дольше `PROFILING_SLOW_MS`. Сводку по представлениям строит
+    команда `profile_report`. Запросы асинхронных представлений идут в
+    другом потоке и здесь не учитываются.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        request._profiling_render = None
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+        if (
+            total * 1000 >= settings.PROFILING_SLOW_MS
+            or random.random() < settings.PROFILING_SAMPLE_RATE
+        ):
+            match = request.resolver_match
+            write_profile({
+                'time': timezone.now().isoformat(),
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'total_ms': round(total * 1000, 2),
+                'sql_count': timer.count,
+                'sql_ms': round(timer.seconds * 1000, 2),
+                'render_ms': (
+                    round(request._profiling_render * 1000, 2)
+                    if request._profiling_render is not None else None
+                ),
+            })
+        return response
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._profiling_render = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class NPlusOneMiddleware:
+    """Ищет N+1 в каждом запросе: в тестах падает, иначе пишет в лог.
+
+    Включается настройкой `N_PLUS_ONE_DETECTION`, поведение задают
+    `N_PLUS_ONE_RAISE` и `N_PLUS_ONE_THRESHOLD`. Проверяется доля
+    запросов `N_PLUS_ONE_SAMPLE_RATE`, остальные идут без разбора стека.
+    Middleware только синхронное, в `settings_asgi` оно не подключено.
+    """
+
+    def __init__(self, get_response):
+        if not settings.N_PLUS_ONE_DETECTION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.N_PLUS_ONE_SAMPLE_RATE:
+            return self.get_response(request)
+        with nplusone.watch() as detector:
+            response = self.get_response(request)
+        repeated = detector.repeated()
+        if repeated:
+            message = 'N+1 в {} {}:\n{}'.format(
+                request.method, request.path, detector.report(repeated)
+            )
+            if settings.N_PLUS_ONE_RAISE:
+                raise nplusone.NPlusOneError(message)
+            logger.warning(message)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Отправляет чтения страниц из `REPLICA_READ_VIEWS` на реплику.
+
+    После записи (успешный не-GET запрос) клиент получает cookie, и
+    `READ_YOUR_WRITES_SECONDS` секунд все его запросы читают с основной
+    базы, чтобы он увидел свои изменения несмотря на отставание реплики.
+
+    Работает и синхронно, и асинхронно: реплика выбирается до вызова
+    следующего обработчика и действует в его контексте, а
+    `sync_to_async` передаёт этот контекст в поток с запросами к базе.
+    """
+
+    cookie_name = 'primary_until'
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        request.read_alias = self.choose_alias(request)
+        with reading_from(request.read_alias):
+            response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        request.read_alias = self.choose_alias(request)
+        with reading_from(request.read_alias):
+            response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def choose_alias(self, request):
+        if request.method not in ('GET', 'HEAD') or self.pinned(request):
+            return None
+        try:
+            match = resolve(
+                request.path_info, getattr(request, 'urlconf', None)
+            )
+        except Resolver404:
+            return None
+        if match.view_name in settings.REPLICA_READ_VIEWS:
+            return choose_replica()
+        return None
+
+    def process_response(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            if response.status_code < 400:
+                self.pin(response)
+        elif request.read_alias and response.streaming:
+            response.streaming_content = self.stream_from(
+                request.read_alias, response.streaming_content
+            )
+        return response
+
+    def pinned(self, request):
+        try:
+            return float(request.COOKIES[self.cookie_name]) > time.time()
+        except (KeyError, ValueError):
+            return False
+
+    def pin(self, response):
+        seconds = settings.READ_YOUR_WRITES_SECONDS
+        response.set_cookie(
+            self.cookie_name, str(time.time() + seconds),
+            max_age=seconds, httponly=True, samesite='Lax'
+        )
+
+    def stream_from(self, alias, content):
+        """Потоковый ответ читается после выхода из представления."""
+        iterator = iter(content)
+        while True:
+            with reading_from(alias):
+                chunk = next(iterator, None)
+            if chunk is None:
+                return
+            yield chunk
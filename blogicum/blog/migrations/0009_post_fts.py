@@ -0,0 +1,36 @@
+# Generated by Django 3.2.16 on 2026-10-17 02:40
+
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE blog_post_fts USING fts5('
+        'title, text, category, location, '
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        'INSERT INTO blog_post_fts (rowid, title, text, category, location) '
+        "SELECT p.id, p.title, p.text, COALESCE(c.title, ''), "
+        "COALESCE(l.name, '') FROM blog_post p "
+        'LEFT JOIN blog_category c ON c.id = p.category_id '
+        'LEFT JOIN blog_location l ON l.id = p.location_id'
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS blog_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_imagejob'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
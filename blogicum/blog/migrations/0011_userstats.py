@@ -0,0 +1,73 @@
+# Generated by Django 3.2.16 on 2026-10-17 01:58
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def count(model, field, aggregate, **filters):
+    return model.objects.filter(
+        author=models.OuterRef('pk'), **filters
+    ).order_by().values('author').annotate(
+        value=aggregate(field)
+    ).values('value')
+
+
+def fill_user_stats(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    UserStats = apps.get_model('blog', 'UserStats')
+    users = User.objects.annotate(
+        published=Coalesce(models.Subquery(
+            count(Post, 'pk', models.Count, is_published=True)
+        ), 0),
+        total=Coalesce(models.Subquery(count(Post, 'pk', models.Count)), 0),
+        comments=Coalesce(
+            models.Subquery(count(Comment, 'pk', models.Count)), 0
+        ),
+        last_post=models.Subquery(count(Post, 'created_at', models.Max)),
+        last_comment=models.Subquery(
+            count(Comment, 'created_date', models.Max)
+        ),
+    )
+    UserStats.objects.bulk_create((
+        UserStats(
+            user_id=user.pk,
+            posts_published=user.published,
+            posts_total=user.total,
+            comments=user.comments,
+            last_activity=max(
+                filter(None, (user.last_post, user.last_comment)),
+                default=None
+            ),
+        ) for user in users.iterator()
+    ), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0010_changelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('posts_published', models.PositiveIntegerField(default=0, verbose_name='Опубликовано публикаций')),
+                ('posts_total', models.PositiveIntegerField(default=0, verbose_name='Всего публикаций')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('last_activity', models.DateTimeField(blank=True, null=True, verbose_name='Последняя активность')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'статистика пользователя',
+                'verbose_name_plural': 'Статистика пользователей',
+            },
+        ),
+        migrations.RunPython(fill_user_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_comment_post_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagejob',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Начато'),
+        ),
+    ]
@@ -1,40 +1,269 @@
+from hashlib import md5
+from itertools import islice
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Count
+from django.core.cache import caches
+from django.db.models import Max, QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import get_template, render_to_string
 from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_response_headers,
+    quote_etag
+)
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils.safestring import mark_safe
 from django.urls import reverse
 from django.shortcuts import redirect
 
+from blog import registry
+from blog.cache import feed_scope, get_versions, version_time
 from blog.models import Post
+from blog.paginators import CursorPaginator
+from blog.schedule import cache_timeout
 
 User = get_user_model()
 
+STREAM_MARKER = '<!-- stream-items -->'
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified по ETag и Last-Modified без рендера.
+
+    `get_validators` вызывается до рендера, поэтому проверка доступа к
+    странице должна быть в нём же: иначе скрытая страница ответит 304.
+    """
+
+    def get_validators(self):
+        """Данные для ETag и время последнего изменения страницы.
+
+        По умолчанию валидаторов нет, и страница всегда рендерится.
+        """
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        parts, last_modified = self.get_validators()
+        if parts is None:
+            return super().get(request, *args, **kwargs)
+        parts = [*parts, request.user.pk, request.user.get_username()]
+        if request.user.is_authenticated:
+            # В формах страницы есть CSRF-токен, а после входа он новый.
+            get_token(request)
+            parts.append(request.META['CSRF_COOKIE'])
+        etag = quote_etag(md5(repr(parts).encode()).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class StreamingListMixin:
+    """Потоковая отдача страницы со списком, если включена настройка.
+
+    Шаблон рендерится один раз с маркером `stream_marker` на месте списка.
+    Всё, что до маркера, отдаётся сразу, затем по одному элементу через
+    `stream_item_template`, затем остаток страницы.
+    """
+
+    streaming = settings.STREAMING_RESPONSES
+    stream_item_template = None
+    stream_item_name = None
+    stream_chunk_size = 100
+
+    def get_stream_items(self, context):
+        """Элементы списка для потоковой отдачи.
+
+        По умолчанию — `object_list` из контекста (для ListView это уже
+        текущая страница), а без него — `get_queryset()`. QuerySet читается
+        через iterator порциями по `stream_chunk_size`, без кэша выборки.
+        """
+        items = context.get('object_list')
+        if items is None:
+            items = self.get_queryset()
+        if isinstance(items, QuerySet):
+            items = items.iterator(chunk_size=self.stream_chunk_size)
+        return items
+
+    def render_to_response(self, context, **response_kwargs):
+        if not self.streaming:
+            return super().render_to_response(context, **response_kwargs)
+        context['stream_marker'] = mark_safe(STREAM_MARKER)
+        head, tail = render_to_string(
+            self.get_template_names(), context, self.request
+        ).split(STREAM_MARKER, 1)
+        item_template = get_template(self.stream_item_template)
+        item_context = {
+            **context, 'user': self.request.user, 'request': self.request
+        }
+
+        def render():
+            yield head
+            for item in self.get_stream_items(context):
+                item_context[self.stream_item_name] = item
+                yield item_template.render(item_context)
+            yield tail
 
-class CommonMixin:
+        return StreamingHttpResponse(render(), **response_kwargs)
+
+
+class AnonymousPageCacheMixin:
+    """Кэширует страницу ленты целиком для неавторизованных посетителей.
+
+    Ключ зависит от версии ленты, которую сбрасывают сигналы моделей,
+    и от номера страницы или курсора.
+    """
+
+    def get_page_cache_scope(self):
+        return feed_scope()
+
+    def get_page_cache_key(self):
+        scope = self.get_page_cache_scope()
+        version, = get_versions(scope)
+        return 'feed_page:{}:{}:{}:{}'.format(
+            scope,
+            version,
+            self.request.GET.get('page', ''),
+            self.request.GET.get('cursor', ''),
+        )
+
+    def get_page_cache_timeout(self):
+        return cache_timeout(settings.FEED_PAGE_CACHE_TIMEOUT)
+
+    def add_expiry_headers(self, response):
+        """Expires и max-age до ближайшей отложенной публикации."""
+        if response.has_header('Expires'):
+            del response['Expires']
+        patch_response_headers(
+            response, cache_timeout(settings.FEED_BROWSER_CACHE_TIMEOUT)
+        )
+        return response
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        cache = caches[settings.FEED_PAGE_CACHE_ALIAS]
+        key = self.get_page_cache_key()
+        response = cache.get(key)
+        if response is not None:
+            return self.add_expiry_headers(
+                get_conditional_response(
+                    request,
+                    etag=response.get('ETag'),
+                    last_modified=parse_http_date_safe(
+                        response.get('Last-Modified')
+                    ),
+                    response=response,
+                )
+            )
+        response = self.add_expiry_headers(
+            super().get(request, *args, **kwargs)
+        )
+
+        def store(response):
+            if not response.cookies:
+                cache.set(key, response, self.get_page_cache_timeout())
+
+        if response.status_code != 200:
+            return response
+        if response.streaming:
+            response.streaming_content = self.store_streamed(
+                response, response.streaming_content, store
+            )
+        else:
+            response.add_post_render_callback(store)
+        return response
+
+    def store_streamed(self, response, content, store):
+        """Отдаёт части ответа и кэширует страницу, когда она собрана."""
+        chunks = []
+        for chunk in content:
+            chunks.append(chunk)
+            yield chunk
+        cached = HttpResponse(b''.join(chunks))
+        for header, value in response.items():
+            cached[header] = value
+        store(cached)
+
+
+class CommonMixin(
+    AnonymousPageCacheMixin, ConditionalGetMixin, StreamingListMixin
+):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = settings.POSTS_PER_PAGE
     ordering = '-pub_date'
+    cursor_pagination = settings.FEED_CURSOR_PAGINATION
+    stream_item_template = 'includes/post_list_item.html'
+    stream_item_name = 'post'
 
     def get_queryset(self):
-        return Post.objects.select_related(
-            'location',
-            'author',
-            'category'
-        ).filter(
+        return Post.objects.select_related('author').filter(
             is_published=True,
-            category__is_published=True,
+            category__isnull=False,
             pub_date__lte=timezone.now()
-        ).annotate(
-            comment_count=Count('comments')
+        ).exclude(
+            category_id__in=registry.hidden_category_ids()
         ).order_by('-pub_date')
 
+    def get_validators(self):
+        scope = self.get_page_cache_scope()
+        version, = get_versions(scope)
+        latest = Post.objects.filter(
+            is_published=True, pub_date__lte=timezone.now()
+        ).aggregate(latest=Max('pub_date'))['latest']
+        return (
+            [scope, version, latest, self.request.get_full_path()],
+            max(filter(None, (version_time(version), latest))),
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.cursor_pagination:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        page = paginator.page(self.request.GET.get('cursor'))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_stream_items(self, context):
+        posts = super().get_stream_items(context)
+        for chunk in chunked(posts, self.stream_chunk_size):
+            yield from registry.attach(chunk)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['cursor_pagination'] = self.cursor_pagination
+        page = context.get('page_obj')
+        if page is not None and not self.streaming:
+            page.object_list = registry.attach(list(page.object_list))
+        if page is not None and not self.cursor_pagination:
+            context['page_range'] = page.paginator.get_elided_page_range(
+                page.number
+            )
+        return context
+
 
 class CommentAuthorCheckMixin:
 
     def test_func(self):
         comment = self.get_object()
-        return self.request.user == comment.author
+        return comment.author_id == self.request.user.pk
 
 
 class EditPostDispatchMixin:
@@ -7,7 +7,8 @@ User = get_user_model()
 
 
 class PublicationModel(models.Model):
-    """Абстрактная модель. Добвляет флаг is_published и поле created_at"""
+    """Абстрактная модель. Добвляет флаг is_published и поля created_at
+    и updated_at"""
 
     is_published = models.BooleanField(
         'Опубликовано',
@@ -15,6 +16,7 @@ class PublicationModel(models.Model):
         help_text='Снимите галочку, чтобы скрыть публикацию.'
     )
     created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
 
     class Meta:
         abstract = True
@@ -81,12 +83,33 @@ class Post(PublicationModel):
         verbose_name='Категория',
     )
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'id'),
+                name='post_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('category', 'pub_date', 'id'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('author', 'pub_date', 'id'),
+                name='post_author_feed_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title[:settings.MAX_TITLE_LENGTH]
@@ -109,8 +132,121 @@ class Comment(models.Model):
     text = models.TextField()
     created_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('post', 'created_date', 'id'),
+                name='comment_post_created_idx',
+            ),
+        )
+
     def __str__(self):
         return f"Комментарий от {self.author} к посту '{self.post.title}'"
 
     def get_absolute_url(self):
-        return reverse('blog:post_detail', args=[str(self.post.id)])
+        return reverse('blog:post_detail', args=[str(self.post_id)])
+
+
+class ImageJob(models.Model):
+    """Задача фоновой обработки изображения публикации."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Готово'),
+        (FAILED, 'Ошибка'),
+    )
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='image_jobs',
+        verbose_name='Публикация',
+    )
+    image = models.CharField('Файл', max_length=100)
+    status = models.CharField(
+        'Статус', max_length=16, choices=STATUSES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    error = models.TextField('Ошибка', blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    started_at = models.DateTimeField('Начато', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'обработка изображения'
+        verbose_name_plural = 'Обработка изображений'
+        ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('status', 'created_at'),
+                name='imagejob_status_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.image} ({self.get_status_display()})'
+
+
+class ChangeLog(models.Model):
+    """Изменение, которое ещё не применено к производным данным.
+
+    Записи создают сигналы моделей, а команда `apply_changes` обновляет
+    по ним поисковый индекс, счётчики и кэши лент и удаляет записи.
+    """
+
+    POST = 'post'
+    POST_COMMENTS = 'post_comments'
+    CATEGORY = 'category'
+    LOCATION = 'location'
+    KINDS = (
+        (POST, 'Публикация'),
+        (POST_COMMENTS, 'Комментарии публикации'),
+        (CATEGORY, 'Категория'),
+        (LOCATION, 'Местоположение'),
+    )
+
+    kind = models.CharField('Объект', max_length=16, choices=KINDS)
+    object_id = models.PositiveBigIntegerField('ID объекта')
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'изменение'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ('pk',)
+
+    def __str__(self):
+        return f'{self.get_kind_display()} #{self.object_id}'
+
+
+class UserStats(models.Model):
+    """Счётчики пользователя для страницы профиля.
+
+    Обновляются сигналами при каждом изменении публикаций и комментариев;
+    команда `recount_user_stats` пересчитывает их заново.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='stats',
+        verbose_name='Пользователь'
+    )
+    posts_published = models.PositiveIntegerField(
+        'Опубликовано публикаций', default=0
+    )
+    posts_total = models.PositiveIntegerField('Всего публикаций', default=0)
+    comments = models.PositiveIntegerField('Комментариев', default=0)
+    last_activity = models.DateTimeField(
+        'Последняя активность', null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = 'статистика пользователя'
+        verbose_name_plural = 'Статистика пользователей'
+
+    def __str__(self):
+        return f'Статистика {self.user}'
@@ -0,0 +1,91 @@
+"""Поиск N+1: повторов чтения одной формы из одного места кода.
+
+SELECT приводится к «форме»: параметры, числа, строки и списки IN
+заменяются заполнителями. Место вызова — ближайший к запросу кадр стека
+вне Django и стандартной библиотеки, то есть строка представления, тега
+или сигнала, из-за которой ORM пошёл в базу. Если одна и та же пара
+(форма, место) встречается `N_PLUS_ONE_THRESHOLD` раз и больше, это почти
+наверняка ленивое обращение к связи в цикле. Записи не учитываются:
+построчные UPDATE из сигналов каскадного удаления — не ошибка.
+"""
+import re
+import sys
+import sysconfig
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+LIBRARY_DIRS = tuple(
+    str(Path(sysconfig.get_paths()[name]).resolve())
+    for name in ('stdlib', 'platstdlib', 'purelib', 'platlib')
+)
+THIS_FILE = str(Path(__file__).resolve())
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+\b')
+_IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)', re.IGNORECASE)
+_SPACES = re.compile(r'\s+')
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+def query_shape(sql):
+    shape = _STRING.sub('?', sql)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('IN (...)', shape)
+    return _SPACES.sub(' ', shape).strip()
+
+
+def call_site():
+    """Ближайший к запросу кадр кода проекта: `файл:строка`."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not (
+            filename.startswith(('<', *LIBRARY_DIRS))
+            or filename == THIS_FILE
+        ):
+            return f'{filename}:{frame.f_lineno}'
+        frame = frame.f_back
+    return None
+
+
+class Detector:
+    """Обёртка execute_wrapper, собирающая формы запросов."""
+
+    def __init__(self):
+        self.queries = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = query_shape(sql)
+        if shape.upper().startswith('SELECT'):
+            self.queries[(shape, call_site())] += 1
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold=None):
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return [
+            (shape, site, count)
+            for (shape, site), count in self.queries.most_common()
+            if count >= threshold and site is not None
+        ]
+
+    def report(self, repeated):
+        return '\n'.join(
+            f'{count} × {site}: {shape}' for shape, site, count in repeated
+        )
+
+
+@contextmanager
+def watch():
+    """Собирает запросы всех подключений внутри блока `with`."""
+    detector = Detector()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(detector))
+        yield detector
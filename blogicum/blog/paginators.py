@@ -0,0 +1,174 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def encode_cursor(direction, value, pk):
+    payload = json.dumps([direction, value.isoformat(), pk])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Возвращает (направление, значение, pk) или бросает Http404."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        direction, value, pk = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        if direction not in (NEXT, PREVIOUS):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(value), int(pk)
+    except (binascii.Error, TypeError, ValueError):
+        raise Http404('Неверный курсор страницы.')
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации без номера и общего количества."""
+
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} objects>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по паре (field, id).
+
+    Вместо OFFSET страница начинается с условия по ключу последнего
+    показанного объекта, поэтому глубина страницы не влияет на стоимость
+    запроса, а COUNT(*) не выполняется вовсе.
+    """
+
+    def __init__(self, queryset, per_page, field='pub_date', descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def _ordering(self, forward):
+        prefix = '-' if self.descending == forward else ''
+        return (f'{prefix}{self.field}', f'{prefix}id')
+
+    def _after(self, value, pk, forward):
+        lookup = 'lt' if self.descending == forward else 'gt'
+        return (
+            Q(**{f'{self.field}__{lookup}': value})
+            | Q(**{self.field: value, f'id__{lookup}': pk})
+        )
+
+    def _cursor(self, direction, obj):
+        return encode_cursor(direction, getattr(obj, self.field), obj.pk)
+
+    def page(self, cursor=None):
+        forward = True
+        queryset = self.queryset
+        if cursor:
+            direction, value, pk = decode_cursor(cursor)
+            forward = direction == NEXT
+            queryset = queryset.filter(self._after(value, pk, forward))
+        objects = list(
+            queryset.order_by(*self._ordering(forward))[:self.per_page + 1]
+        )
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if not forward:
+            objects.reverse()
+        if not objects:
+            return CursorPage(objects, self)
+        has_next = has_more if forward else True
+        has_previous = bool(cursor) if forward else has_more
+        return CursorPage(
+            objects,
+            self,
+            next_cursor=(
+                self._cursor(NEXT, objects[-1]) if has_next else None
+            ),
+            previous_cursor=(
+                self._cursor(PREVIOUS, objects[0]) if has_previous else None
+            ),
+        )
+
+
+def estimated_rows(model):
+    """Оценка числа строк таблицы из статистики СУБД или None.
+
+    В sqlite_stat1 первое число строки индекса — число строк в индексе,
+    поэтому частичные индексы не подходят: в них только часть таблицы.
+    """
+    table = model._meta.db_table
+    queries = {
+        'sqlite': (
+            'SELECT stat FROM sqlite_stat1 WHERE tbl = %s AND ('
+            'idx IS NULL OR idx IN ('
+            'SELECT name FROM pragma_index_list(%s) WHERE NOT partial'
+            ')) ORDER BY idx IS NULL DESC, idx LIMIT 1'
+        ),
+        'postgresql': (
+            'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+        ),
+    }
+    if connection.vendor not in queries:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            query = queries[connection.vendor]
+            cursor.execute(query, [table] * query.count('%s'))
+            row = cursor.fetchone()
+    except DatabaseError:
+        # sqlite_stat1 появляется только после ANALYZE.
+        return None
+    if row is None:
+        return None
+    return int(str(row[0]).split()[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, который считает строки точно только до порога.
+
+    Дальше порога для всей таблицы берётся оценка из статистики СУБД,
+    а для отфильтрованной выборки — сам порог: полный COUNT(*) по большой
+    таблице стоит дороже, чем показ страницы.
+    """
+
+    exact_limit = 10000
+
+    @cached_property
+    def count(self):
+        counted = self.object_list[:self.exact_limit + 1].count()
+        if counted <= self.exact_limit:
+            return counted
+        estimate = None
+        if not self.object_list.query.where:
+            estimate = estimated_rows(self.object_list.model)
+        return max(estimate or 0, self.exact_limit)
@@ -0,0 +1,82 @@
+"""Справочники категорий и местоположений в памяти процесса.
+
+Таблицы маленькие и меняются редко, поэтому ленты не присоединяют их
+к запросу публикаций, а берут объекты отсюда. Актуальность проверяется
+по версии `lookups` в общем кэше версий: сигналы сбрасывают её при любом
+изменении категории или местоположения, и каждый процесс перечитывает
+обе таблицы. Изменения в обход сигналов (`QuerySet.update`, правка базы
+вручную) или потерянная кэшем версия видны не позже чем через `MAX_AGE`
+секунд.
+"""
+import time
+
+from blog.cache import get_versions
+from blog.models import Category, Location
+
+VERSION = 'lookups'
+MAX_AGE = 60
+
+_tables = {
+    'version': None,
+    'loaded_at': None,
+    'categories': {},
+    'slugs': {},
+    'locations': {},
+}
+
+
+def tables():
+    global _tables
+    version, = get_versions(VERSION)
+    loaded_at = _tables['loaded_at']
+    if (
+        _tables['version'] != version
+        or loaded_at is None
+        or time.monotonic() - loaded_at > MAX_AGE
+    ):
+        categories = {
+            category.pk: category for category in Category.objects.all()
+        }
+        _tables = {
+            'version': version,
+            'loaded_at': time.monotonic(),
+            'categories': categories,
+            'slugs': {
+                category.slug: category for category in categories.values()
+            },
+            'locations': {
+                location.pk: location for location in Location.objects.all()
+            },
+        }
+    return _tables
+
+
+def published_category(slug):
+    category = tables()['slugs'].get(slug)
+    return category if category and category.is_published else None
+
+
+def hidden_category_ids():
+    """Снятые с публикации категории.
+
+    Ленты исключают их через NOT IN: список обычно короткий и, в отличие
+    от IN по опубликованным, не мешает сортировке по индексу ленты.
+    """
+    return [
+        pk for pk, category in tables()['categories'].items()
+        if not category.is_published
+    ]
+
+
+def attach(posts):
+    """Подставляет категории и местоположения публикаций без запросов."""
+    current = tables()
+    for post in posts:
+        for field, table in (
+            ('category', current['categories']),
+            ('location', current['locations']),
+        ):
+            related_id = getattr(post, f'{field}_id')
+            if related_id is None or related_id in table:
+                setattr(post, field, table.get(related_id))
+    return posts
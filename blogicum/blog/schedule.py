@@ -0,0 +1,60 @@
+"""Граница ближайшей отложенной публикации.
+
+Набор видимых в лентах публикаций меняется не только при сохранении
+моделей, но и когда наступает `pub_date` отложенной публикации. Кэши лент
+и HTTP-заголовки должны истекать не позже этого момента.
+
+Граница хранится в общем кэше, и её сбрасывает любой процесс, который
+меняет публикации. Срок хранения всё равно ограничен
+`NEXT_PUBLICATION_TTL`: публикацию могли изменить в обход сигналов.
+"""
+from math import ceil
+
+from django.db.models import Min
+from django.utils import timezone
+
+from blog.cache import shared_cache
+from blog.models import Post
+
+NEXT_PUBLICATION_KEY = 'schedule:next_publication'
+NO_PUBLICATION = 'none'
+NEXT_PUBLICATION_TTL = 60
+
+
+def next_publication():
+    """Ближайшая будущая дата публикации или None."""
+    now = timezone.now()
+    cache = shared_cache()
+    boundary = cache.get(NEXT_PUBLICATION_KEY)
+    if boundary == NO_PUBLICATION:
+        return None
+    if boundary is not None and boundary > now:
+        return boundary
+    boundary = Post.objects.filter(
+        is_published=True, pub_date__gt=now
+    ).aggregate(next=Min('pub_date'))['next']
+    if boundary is None:
+        cache.set(NEXT_PUBLICATION_KEY, NO_PUBLICATION, NEXT_PUBLICATION_TTL)
+    else:
+        cache.set(
+            NEXT_PUBLICATION_KEY,
+            boundary,
+            min(
+                ceil((boundary - now).total_seconds()),
+                NEXT_PUBLICATION_TTL
+            ),
+        )
+    return boundary
+
+
+def reset_next_publication():
+    shared_cache().delete(NEXT_PUBLICATION_KEY)
+
+
+def cache_timeout(maximum):
+    """Таймаут не дольше `maximum` секунд и не дальше границы."""
+    boundary = next_publication()
+    if boundary is None:
+        return maximum
+    seconds = ceil((boundary - timezone.now()).total_seconds())
+    return max(0, min(maximum, seconds))
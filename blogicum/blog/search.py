@@ -0,0 +1,156 @@
+"""Полнотекстовый поиск по публикациям на SQLite FTS5.
+
+Таблица `blog_post_fts` хранит заголовок, текст, название категории и
+места; rowid совпадает с id публикации. Индекс обновляет обработчик
+журнала изменений (`apply_changes`), полностью его пересобирает команда
+`rebuild_search_index`.
+"""
+import re
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+FTS_TABLE = 'blog_post_fts'
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+# Веса столбцов для bm25: title, text, category, location.
+COLUMN_WEIGHTS = (10.0, 1.0, 2.0, 2.0)
+
+INDEX_SELECT = (
+    'SELECT p.id, p.title, p.text, COALESCE(c.title, \'\'), '
+    'COALESCE(l.name, \'\') '
+    'FROM blog_post p '
+    'LEFT JOIN blog_category c ON c.id = p.category_id '
+    'LEFT JOIN blog_location l ON l.id = p.location_id'
+)
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def _subquery(queryset):
+    return queryset.order_by().values('pk').query.sql_with_params()
+
+
+def index_posts(queryset):
+    """Переиндексирует публикации из queryset одним INSERT ... SELECT."""
+    if not is_available():
+        return
+    try:
+        sql, params = _subquery(queryset)
+    except EmptyResultSet:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({sql})', params
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} '
+            '(rowid, title, text, category, location) '
+            f'{INDEX_SELECT} WHERE p.id IN ({sql})',
+            params,
+        )
+
+
+def remove_posts(post_ids):
+    if not is_available() or not post_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+            list(post_ids),
+        )
+
+
+def rebuild_index():
+    """Полностью пересобирает индекс; возвращает число публикаций."""
+    if not is_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} '
+            f'(rowid, title, text, category, location) {INDEX_SELECT}'
+        )
+        cursor.execute(f'SELECT count(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def match_expression(query):
+    """Запрос пользователя в синтаксисе FTS5: все слова, по префиксу."""
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def matching_ids(query):
+    """Подзапрос id публикаций, подходящих под запрос."""
+    return RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (match_expression(query),),
+    )
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(HIGHLIGHT_START, '<mark>')
+        .replace(HIGHLIGHT_END, '</mark>')
+    )
+
+
+class SearchResults:
+    """Результаты поиска для Paginator, ранжированные по bm25.
+
+    `visible` — queryset видимых публикаций; поиск ограничен им, поэтому
+    правила видимости совпадают с лентами.
+    """
+
+    def __init__(self, query, visible):
+        self.match = match_expression(query)
+        self.visible = visible
+
+    def _execute(self, select, select_params=(), suffix='',
+                 suffix_params=()):
+        sql, params = _subquery(self.visible)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT {select} FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid IN ({sql}) {suffix}',
+                (*select_params, self.match, *params, *suffix_params),
+            )
+            return cursor.fetchall()
+
+    def count(self):
+        if not self.match:
+            return 0
+        return self._execute('count(*)')[0][0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        if not self.match:
+            return []
+        start = index.start or 0
+        rows = self._execute(
+            f'rowid, snippet({FTS_TABLE}, -1, %s, %s, %s, 16)',
+            (HIGHLIGHT_START, HIGHLIGHT_END, '…'),
+            'ORDER BY bm25({}, {}) LIMIT %s OFFSET %s'.format(
+                FTS_TABLE, ', '.join(map(str, COLUMN_WEIGHTS))
+            ),
+            (index.stop - start, start),
+        )
+        posts = self.visible.in_bulk([post_id for post_id, _ in rows])
+        results = []
+        for post_id, snippet in rows:
+            if post_id in posts:
+                posts[post_id].search_snippet = highlight(snippet)
+                results.append(posts[post_id])
+        return results
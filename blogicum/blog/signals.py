@@ -0,0 +1,288 @@
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save
+)
+from django.dispatch import receiver
+
+from blog import changelog, registry
+from blog.cache import bump_feeds, bump_versions, post_feeds
+from blog.images import delete_variants
+from blog.jobs import enqueue_image_job
+from blog.models import (
+    Category,
+    ChangeLog,
+    Comment,
+    Location,
+    Post,
+    UserStats
+)
+from blog.schedule import reset_next_publication
+from blog.stats import change_stats
+
+User = get_user_model()
+
+# Публикации, которые удаляются сейчас вместе со своими комментариями.
+_deleted_post_ids = ContextVar('deleted_post_ids', default=frozenset())
+
+
+def change_comment_count(post_id, delta):
+    Post.objects.filter(pk=post_id).update(
+        comment_count=F('comment_count') + delta
+    )
+    bump_versions(f'post:{post_id}')
+    bump_feeds(post_feeds(Post.objects.filter(pk=post_id)))
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    """Запоминает исходный пост комментария, если его меняют в админке."""
+    if instance.pk is None:
+        return
+    instance._previous_post_id = Comment.objects.filter(
+        pk=instance.pk
+    ).values_list('post_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        change_comment_count(instance.post_id, 1)
+        return
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if previous_post_id and previous_post_id != instance.post_id:
+        change_comment_count(previous_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(pre_delete, sender=Comment)
+def forget_stale_deleted_post(sender, instance, **kwargs):
+    """Снимает отметку с поста, если его удаление прервалось ошибкой.
+
+    Комментарии получают pre_delete раньше своей публикации, поэтому
+    при каскаде отметку тут же вернёт `remember_deleted_post`, а
+    отдельное удаление комментария снова меняет счётчик.
+    """
+    _deleted_post_ids.set(_deleted_post_ids.get() - {instance.post_id})
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    # Счётчик и ленты удаляемой публикации не нужны: их сбросит её
+    # собственный сигнал, а не запрос на каждый комментарий каскада.
+    if instance.post_id not in _deleted_post_ids.get():
+        change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comments_version(sender, instance, **kwargs):
+    post_ids = {instance.post_id, getattr(instance, '_previous_post_id', None)}
+    bump_versions(
+        *(f'comments:{post_id}' for post_id in post_ids if post_id)
+    )
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+def remember_post_feeds(sender, instance, **kwargs):
+    """Ленты, где публикация видна до изменения или удаления."""
+    instance._previous_feeds = (
+        post_feeds(Post.objects.filter(pk=instance.pk))
+        if instance.pk else set()
+    )
+
+
+@receiver(post_save, sender=Post)
+def bump_post_version(sender, instance, **kwargs):
+    reset_next_publication()
+    bump_versions(f'post:{instance.pk}')
+    bump_feeds(
+        instance._previous_feeds
+        | post_feeds(Post.objects.filter(pk=instance.pk))
+    )
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post(sender, instance, **kwargs):
+    _deleted_post_ids.set(_deleted_post_ids.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post(sender, instance, **kwargs):
+    _deleted_post_ids.set(_deleted_post_ids.get() - {instance.pk})
+
+
+@receiver(post_delete, sender=Post)
+def bump_deleted_post_version(sender, instance, **kwargs):
+    reset_next_publication()
+    bump_versions(f'post:{instance.pk}')
+    bump_feeds(instance._previous_feeds)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    """Изображение, автор и статус публикации до сохранения."""
+    instance._previous_image = None
+    instance._previous_author_id = None
+    instance._previous_is_published = None
+    if instance.pk is None:
+        return
+    previous = Post.objects.filter(pk=instance.pk).values_list(
+        'image', 'author_id', 'is_published'
+    ).first()
+    if previous:
+        (
+            instance._previous_image,
+            instance._previous_author_id,
+            instance._previous_is_published,
+        ) = previous
+
+
+@receiver(post_save, sender=Post)
+def update_image_variants(sender, instance, raw, **kwargs):
+    if raw or instance.image.name == instance._previous_image:
+        return
+    if instance._previous_image:
+        delete_variants(instance._previous_image)
+    if instance.image:
+        enqueue_image_job(instance)
+
+
+@receiver(post_delete, sender=Post)
+def delete_image_variants(sender, instance, **kwargs):
+    if instance.image:
+        delete_variants(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+def count_user_post(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    published = int(instance.is_published)
+    if created or instance._previous_author_id is None:
+        change_stats(
+            instance.author_id, posts_total=1, posts_published=published
+        )
+    elif instance._previous_author_id != instance.author_id:
+        change_stats(
+            instance._previous_author_id, posts_total=-1,
+            posts_published=-int(instance._previous_is_published)
+        )
+        change_stats(
+            instance.author_id, posts_total=1, posts_published=published
+        )
+    elif instance._previous_is_published != instance.is_published:
+        change_stats(
+            instance.author_id,
+            posts_published=published - instance._previous_is_published
+        )
+
+
+@receiver(post_delete, sender=Post)
+def uncount_user_post(sender, instance, **kwargs):
+    change_stats(
+        instance.author_id, create=False, posts_total=-1,
+        posts_published=-int(instance.is_published)
+    )
+
+
+@receiver(post_save, sender=Comment)
+def count_user_comment(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        change_stats(instance.author_id, comments=1)
+        bump_feeds({(None, instance.author_id)})
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_user_comment(sender, instance, **kwargs):
+    change_stats(instance.author_id, create=False, comments=-1)
+    bump_feeds({(None, instance.author_id)})
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def log_post_change(sender, instance, **kwargs):
+    changelog.record(ChangeLog.POST, instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def log_comment_change(sender, instance, **kwargs):
+    changelog.record(
+        ChangeLog.POST_COMMENTS,
+        *{instance.post_id, getattr(instance, '_previous_post_id', None)}
+    )
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+def log_detached_posts(sender, instance, **kwargs):
+    """Публикации, у которых после удаления поле станет NULL."""
+    field = 'category' if sender is Category else 'location'
+    changelog.record_posts(Post.objects.filter(**{field: instance.pk}))
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_slug(sender, instance, **kwargs):
+    instance._previous_slug = Category.objects.filter(
+        pk=instance.pk
+    ).values_list('slug', flat=True).first() if instance.pk else None
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_category_version(sender, instance, **kwargs):
+    """Сбрасывает ленту категории; ленты авторов — через журнал."""
+    bump_versions(f'category:{instance.pk}', registry.VERSION)
+    bump_feeds({
+        (instance.slug, None),
+        (getattr(instance, '_previous_slug', None), None),
+    })
+    changelog.record(ChangeLog.CATEGORY, instance.pk)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def bump_location_version(sender, instance, **kwargs):
+    bump_versions(f'location:{instance.pk}', registry.VERSION)
+    bump_feeds(set())
+    changelog.record(ChangeLog.LOCATION, instance.pk)
+
+
+@receiver(post_save, sender=User)
+def create_user_stats(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        UserStats.objects.create(user=instance)
+
+
+@receiver(pre_delete, sender=User)
+def delete_user_stats(sender, instance, **kwargs):
+    """Удаляет статистику до каскада: счётчики удаляемого не нужны.
+
+    Сигналы удаления публикаций и комментариев пропускают пользователя
+    без строки статистики. Сигнал вызывается в транзакции удаления, и
+    при ошибке строка вернётся.
+    """
+    UserStats.objects.filter(user_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=User)
+def bump_user_version(sender, instance, update_fields=None, **kwargs):
+    if update_fields and 'username' not in update_fields:
+        return
+    bump_versions(f'user:{instance.pk}')
+    feeds = post_feeds(Post.objects.filter(author=instance.pk))
+    feeds.add((None, instance.pk))
+    bump_feeds(feeds)
+    commented_posts = Comment.objects.filter(
+        author=instance.pk
+    ).values_list('post_id', flat=True).distinct()
+    bump_versions(*(f'comments:{post_id}' for post_id in commented_posts))
@@ -0,0 +1,65 @@
+"""Счётчики публикаций и комментариев пользователей (`UserStats`)."""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from blog.models import Comment, Post, UserStats
+
+User = get_user_model()
+
+
+def change_stats(user_id, create=True, **deltas):
+    """Прибавляет к счётчикам пользователя значения из `deltas`.
+
+    Если строки статистики ещё нет, она создаётся полным пересчётом, а
+    при `create=False` изменение пропускается: так вызывают сигналы
+    удаления, когда строку могли удалить вместе с пользователем.
+    """
+    updated = UserStats.objects.filter(user_id=user_id).update(
+        last_activity=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated and create:
+        recount_stats(User.objects.filter(pk=user_id))
+
+
+def _subquery(model, field, aggregate, **filters):
+    return Subquery(
+        model.objects.filter(author=OuterRef('pk'), **filters).order_by()
+        .values('author').annotate(value=aggregate(field)).values('value')
+    )
+
+
+def recount_stats(users, batch_size=1000):
+    """Точно пересчитывает статистику пользователей из queryset."""
+    users = users.order_by('pk').annotate(
+        stats_posts_published=Coalesce(
+            _subquery(Post, 'pk', Count, is_published=True), 0
+        ),
+        stats_posts_total=Coalesce(_subquery(Post, 'pk', Count), 0),
+        stats_comments=Coalesce(_subquery(Comment, 'pk', Count), 0),
+        stats_last_post=_subquery(Post, 'created_at', Max),
+        stats_last_comment=_subquery(Comment, 'created_date', Max),
+    )
+    stats = []
+    for user in users.iterator():
+        activity = [
+            moment for moment in (
+                user.stats_last_post, user.stats_last_comment
+            ) if moment is not None
+        ]
+        stats.append(UserStats(
+            user_id=user.pk,
+            posts_published=user.stats_posts_published,
+            posts_total=user.stats_posts_total,
+            comments=user.stats_comments,
+            last_activity=max(activity, default=None),
+        ))
+    with transaction.atomic():
+        UserStats.objects.filter(
+            user_id__in=[item.user_id for item in stats]
+        ).delete()
+        UserStats.objects.bulk_create(stats, batch_size=batch_size)
+    return len(stats)
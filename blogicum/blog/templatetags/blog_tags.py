@@ -0,0 +1,54 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog.cache import post_card_versions
+from blog.images import VARIANTS, variant_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    """Карточка публикации из кэша фрагментов.
+
+    Ключ включает версии публикации, категории, места и автора, поэтому
+    любое их изменение приводит к новой отрисовке карточки.
+    """
+    key = 'post_card:{}:{}'.format(
+        post.pk, ':'.join(post_card_versions(post))
+    )
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string('includes/post_card.html', {'post': post})
+        cache.set(key, html, settings.POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, variant, css_class=''):
+    """Изображение публикации с подходящей копией и srcset.
+
+    Пока копии не созданы, выводится оригинал.
+    """
+    name = post.image.name
+    srcset, webp_srcset = [], []
+    for width_variant in ('card', 'detail'):
+        width = VARIANTS[width_variant]['size'][0]
+        url = variant_url(name, width_variant)
+        if url:
+            srcset.append(f'{url} {width}w')
+        webp_url = variant_url(name, width_variant, webp=True)
+        if webp_url:
+            webp_srcset.append(f'{webp_url} {width}w')
+    width = VARIANTS[variant]['size'][0]
+    return {
+        'original_url': post.image.url,
+        'src': variant_url(name, variant) or post.image.url,
+        'srcset': ', '.join(srcset),
+        'webp_srcset': ', '.join(webp_srcset),
+        'sizes': f'(max-width: {width}px) 100vw, {width}px',
+        'css_class': css_class,
+    }
@@ -0,0 +1,471 @@
+"""Потоковые выгрузка и загрузка данных блога (`export_blog`, `import_blog`).
+
+Записи идут в порядке: пользователи, категории, местоположения, затем
+каждая публикация и сразу за ней её комментарии. Связи записаны
+естественными ключами: пользователь — username, категория — slug,
+местоположение — name. Публикация получает в выгрузке номер `ref`, на
+который ссылаются её комментарии.
+
+Форматы: JSON lines (одна запись `{"model": ..., "fields": ...}` на
+строку) и CSV — каталог с файлом на каждую модель; комментарии в
+`comments.csv` упорядочены так же, как публикации в `posts.csv`.
+
+Загрузка вставляет записи `bulk_create` пачками, поэтому сигналы моделей
+не срабатывают: счётчики, статистику, поисковый индекс и кэши команда
+`import_blog` пересчитывает один раз в конце. Все пачки записываются в
+одной транзакции: при ошибке база не меняется, и загрузку можно просто
+запустить снова. Существующие пользователи,
+категории и места с тем же ключом не перезаписываются; файлы изображений
+не переносятся, только их имена. Ошибки во входных данных сообщаются
+как `TransferError` с номером записи в потоке (для JSON lines без
+пустых строк он совпадает с номером строки).
+"""
+import csv
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.db.models import Max
+from django.utils.dateparse import parse_datetime
+
+from blog.cache import bump_feeds, bump_versions
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+USER = 'user'
+CATEGORY = 'category'
+LOCATION = 'location'
+POST = 'post'
+COMMENT = 'comment'
+MODELS = (USER, CATEGORY, LOCATION, POST, COMMENT)
+CSV_FILES = {
+    USER: 'users.csv',
+    CATEGORY: 'categories.csv',
+    LOCATION: 'locations.csv',
+    POST: 'posts.csv',
+    COMMENT: 'comments.csv',
+}
+
+# Поле выгрузки -> поле values() при выгрузке.
+FIELDS = {
+    USER: {
+        'username': 'username',
+        'email': 'email',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'password': 'password',
+        'is_active': 'is_active',
+        'is_staff': 'is_staff',
+        'is_superuser': 'is_superuser',
+        'date_joined': 'date_joined',
+    },
+    CATEGORY: {
+        'slug': 'slug',
+        'title': 'title',
+        'description': 'description',
+        'is_published': 'is_published',
+        'created_at': 'created_at',
+    },
+    LOCATION: {
+        'name': 'name',
+        'is_published': 'is_published',
+        'created_at': 'created_at',
+    },
+    POST: {
+        'ref': 'pk',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'author': 'author__username',
+        'category': 'category__slug',
+        'location': 'location__name',
+        'image': 'image',
+        'is_published': 'is_published',
+        'created_at': 'created_at',
+    },
+    COMMENT: {
+        'post': 'post_id',
+        'author': 'author__username',
+        'text': 'text',
+        'created_date': 'created_date',
+    },
+}
+BOOLEANS = {'is_active', 'is_staff', 'is_superuser', 'is_published'}
+DATETIMES = {'date_joined', 'created_at', 'pub_date', 'created_date'}
+INTEGERS = {'ref', 'post'}
+NULLABLE = {'category', 'location'}
+
+
+class TransferError(Exception):
+    pass
+
+
+def _values(queryset, model):
+    fields = FIELDS[model]
+    return (
+        {name: row[source] for name, source in fields.items()}
+        for row in queryset.values(*fields.values()).iterator()
+    )
+
+
+def export_records(batch_size=1000):
+    """Записи (модель, поля) в порядке, который ожидает загрузка."""
+    yield from ((USER, row) for row in _values(
+        User.objects.order_by('pk'), USER
+    ))
+    yield from ((CATEGORY, row) for row in _values(
+        Category.objects.order_by('pk'), CATEGORY
+    ))
+    yield from ((LOCATION, row) for row in _values(
+        Location.objects.order_by('pk'), LOCATION
+    ))
+    last_pk = 0
+    while True:
+        posts = list(_values(
+            Post.objects.filter(pk__gt=last_pk).order_by('pk')[:batch_size],
+            POST
+        ))
+        if not posts:
+            return
+        last_pk = posts[-1]['ref']
+        comments = {}
+        for row in _values(Comment.objects.filter(
+            post_id__in=[post['ref'] for post in posts]
+        ).order_by('post_id', 'created_date', 'pk'), COMMENT):
+            comments.setdefault(row['post'], []).append(row)
+        for post in posts:
+            yield POST, post
+            yield from ((COMMENT, row) for row in comments.get(
+                post['ref'], ()
+            ))
+
+
+def summary(action, counts, seconds):
+    """Строка отчёта: сколько записей каждой модели и с какой скоростью."""
+    total = sum(counts.values())
+    details = ', '.join(f'{model}: {counts[model]}' for model in MODELS)
+    rate = total / seconds if seconds else 0
+    return (
+        f'{action} записей: {total} ({details}) за {seconds:.1f} с,'
+        f' {rate:.0f} записей/с'
+    )
+
+
+def _json_value(value):
+    # DjangoJSONEncoder обрезает время до миллисекунд.
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} не сериализуется в JSON')
+
+
+def write_jsonl(records, stream):
+    counts = dict.fromkeys(MODELS, 0)
+    for model, fields in records:
+        stream.write(json.dumps(
+            {'model': model, 'fields': fields},
+            default=_json_value, ensure_ascii=False
+        ) + '\n')
+        counts[model] += 1
+    return counts
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def write_csv(records, directory):
+    os.makedirs(directory, exist_ok=True)
+    counts = dict.fromkeys(MODELS, 0)
+    with open_csv_files(directory, 'w') as files:
+        writers = {}
+        for model, file in files.items():
+            writers[model] = csv.DictWriter(file, fieldnames=FIELDS[model])
+            writers[model].writeheader()
+        for model, fields in records:
+            writers[model].writerow(
+                {name: _csv_value(value) for name, value in fields.items()}
+            )
+            counts[model] += 1
+    return counts
+
+
+@contextmanager
+def open_csv_files(directory, mode):
+    """Открывает CSV-файлы всех моделей в каталоге."""
+    files = {}
+    try:
+        for model in MODELS:
+            files[model] = open(
+                os.path.join(directory, CSV_FILES[model]), mode,
+                newline='', encoding='utf-8'
+            )
+        yield files
+    finally:
+        for file in files.values():
+            file.close()
+
+
+def read_jsonl(stream):
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            model, fields = record['model'], record['fields']
+        except (ValueError, KeyError, TypeError):
+            raise TransferError(f'Строка {number}: неверная запись.')
+        yield model, fields
+
+
+def read_csv(directory):
+    """Записи из CSV-каталога в том же порядке, что и в JSON lines.
+
+    Комментарии сливаются с публикациями по `ref`: оба файла
+    упорядочены по нему, поэтому в памяти нет ничего, кроме текущей
+    строки каждого файла.
+    """
+    with open_csv_files(directory, 'r') as files:
+        for model in (USER, CATEGORY, LOCATION):
+            yield from ((model, row) for row in csv.DictReader(files[model]))
+        comments = csv.DictReader(files[COMMENT])
+        comment = next(comments, None)
+        for post in csv.DictReader(files[POST]):
+            yield POST, post
+            while comment is not None and comment['post'] == post['ref']:
+                yield COMMENT, comment
+                comment = next(comments, None)
+        if comment is not None:
+            raise TransferError(
+                f'Комментарий к публикации {comment["post"]} не следует'
+                ' за ней в posts.csv.'
+            )
+
+
+def convert(fields):
+    """Приводит значения из JSON или CSV к типам полей модели."""
+    result = {}
+    for name, value in fields.items():
+        try:
+            if name in NULLABLE and value in (None, ''):
+                result[name] = None
+            elif name in BOOLEANS and isinstance(value, str):
+                result[name] = value.lower() in ('1', 'true')
+            elif name in DATETIMES and isinstance(value, str):
+                result[name] = parse_datetime(value)
+                if result[name] is None:
+                    raise ValueError(value)
+            elif name in INTEGERS:
+                result[name] = int(value)
+            else:
+                result[name] = value
+        except (TypeError, ValueError):
+            raise TransferError(
+                f'Неверное значение поля {name}: {value!r}.'
+            ) from None
+    return result
+
+
+@contextmanager
+def explicit_timestamps():
+    """Даты создания берутся из выгрузки, а не из auto_now_add.
+
+    Флаг меняется у поля модели для всего процесса, поэтому загрузку
+    нельзя запускать там, где обслуживаются запросы.
+    """
+    fields = [
+        Category._meta.get_field('created_at'),
+        Location._meta.get_field('created_at'),
+        Post._meta.get_field('created_at'),
+        Comment._meta.get_field('created_date'),
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Importer:
+    """Загружает поток записей пачками по `batch_size`.
+
+    id публикаций назначаются заранее, начиная с текущего максимума:
+    Django 3.2 не возвращает первичные ключи из `bulk_create` на SQLite,
+    а комментариям нужен id своей публикации. Поэтому загрузка идёт в
+    одной транзакции, и другие процессы не пишут в базу до её конца.
+    Версии кэша сбрасывает `invalidate` после фиксации транзакции.
+    """
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.pending = {model: [] for model in MODELS}
+        self.counts = dict.fromkeys(MODELS, 0)
+        self.user_ids = {}
+        self.category_ids = {}
+        self.location_ids = dict(
+            Location.objects.order_by('-pk').values_list('name', 'pk')
+        )
+        self.next_post_id = (
+            Post.objects.aggregate(last=Max('pk'))['last'] or 0
+        ) + 1
+        self.post = None
+        self.post_ids = []
+        self.feeds = set()
+        self.number = 0
+        self.creators = {
+            USER: self.create_users,
+            CATEGORY: self.create_categories,
+            LOCATION: self.create_locations,
+            POST: self.create_posts,
+            COMMENT: self.create_comments,
+        }
+
+    def add(self, model, fields):
+        self.number += 1
+        try:
+            fields = self.prepare(model, fields)
+        except TransferError as error:
+            raise TransferError(f'Запись {self.number}: {error}') from None
+        self.pending[model].append((self.number, fields))
+        if len(self.pending[model]) >= self.batch_size:
+            self.flush(model)
+
+    def prepare(self, model, fields):
+        if model not in self.pending:
+            raise TransferError(f'Неизвестная модель {model!r}.')
+        missing = set(FIELDS[model]) - set(fields)
+        if missing:
+            raise TransferError(
+                f'В записи {model} нет полей: ' + ', '.join(sorted(missing))
+            )
+        fields = convert({name: fields[name] for name in FIELDS[model]})
+        if model == POST:
+            fields['id'] = self.next_post_id
+            self.next_post_id += 1
+            self.post = (fields.pop('ref'), fields['id'])
+        elif model == COMMENT:
+            if self.post is None or fields['post'] != self.post[0]:
+                raise TransferError(
+                    f'Комментарий к публикации {fields["post"]} должен идти'
+                    ' сразу за ней.'
+                )
+            fields['post'] = self.post[1]
+        return fields
+
+    def flush(self, model=COMMENT):
+        """Записывает накопленное для `model` и всех моделей до неё."""
+        for current in MODELS[:MODELS.index(model) + 1]:
+            rows = self.pending[current]
+            if not rows:
+                continue
+            try:
+                self.creators[current]([fields for _, fields in rows])
+            except (TransferError, DatabaseError, ValueError) as error:
+                raise TransferError(
+                    f'Записи {current} с {rows[0][0]} по {rows[-1][0]}:'
+                    f' {error}'
+                ) from None
+            self.counts[current] += len(rows)
+            self.pending[current] = []
+
+    def create_users(self, rows):
+        User.objects.bulk_create(
+            [User(**row) for row in rows], ignore_conflicts=True
+        )
+
+    def create_categories(self, rows):
+        Category.objects.bulk_create(
+            [Category(**row) for row in rows], ignore_conflicts=True
+        )
+
+    def create_locations(self, rows):
+        # Название — естественный ключ: одноимённые места не дублируются.
+        new = {}
+        for row in rows:
+            if row['name'] not in self.location_ids:
+                new.setdefault(row['name'], Location(**row))
+        Location.objects.bulk_create(new.values())
+        self.location_ids.update(
+            Location.objects.filter(name__in=new).order_by('-pk')
+            .values_list('name', 'pk')
+        )
+
+    def resolve(self, cache, model, field, keys):
+        missing = set(keys) - set(cache) - {None}
+        if missing:
+            cache.update(
+                model.objects.filter(**{f'{field}__in': missing})
+                .values_list(field, 'pk')
+            )
+        unknown = missing - set(cache)
+        if unknown:
+            raise TransferError(
+                f'Не найдены {model._meta.verbose_name_plural}: '
+                + ', '.join(sorted(unknown))
+            )
+
+    def create_posts(self, rows):
+        self.resolve(
+            self.user_ids, User, 'username', [row['author'] for row in rows]
+        )
+        self.resolve(
+            self.category_ids, Category, 'slug',
+            [row['category'] for row in rows]
+        )
+        posts = []
+        for row in rows:
+            author = row.pop('author')
+            category = row.pop('category')
+            location = row.pop('location')
+            if location is not None and location not in self.location_ids:
+                raise TransferError(
+                    f'Не найдено местоположение {location!r}.'
+                )
+            self.feeds.add((category, self.user_ids[author]))
+            posts.append(Post(
+                **row,
+                author_id=self.user_ids[author],
+                category_id=self.category_ids.get(category),
+                location_id=self.location_ids.get(location),
+            ))
+        Post.objects.bulk_create(posts)
+        self.post_ids.extend(post.pk for post in posts)
+
+    def create_comments(self, rows):
+        self.resolve(
+            self.user_ids, User, 'username', [row['author'] for row in rows]
+        )
+        Comment.objects.bulk_create([
+            Comment(
+                post_id=row['post'],
+                author_id=self.user_ids[row['author']],
+                text=row['text'],
+                created_date=row['created_date'],
+            )
+            for row in rows
+        ])
+
+    def finish(self):
+        self.flush()
+
+    def invalidate(self):
+        """Сбрасывает версии загруженных публикаций и их лент."""
+        # id могли принадлежать удалённым публикациям с карточками в кэше.
+        for start in range(0, len(self.post_ids), self.batch_size):
+            bump_versions(*(
+                f'{name}:{pk}'
+                for pk in self.post_ids[start:start + self.batch_size]
+                for name in ('post', 'comments')
+            ))
+        bump_feeds(self.feeds)
@@ -15,6 +15,11 @@ post_urlpatterns = [
         views.EditPostView.as_view(),
         name='edit_post'
     ),
+    path(
+        '<int:pk>/comments/',
+        views.PostCommentsView.as_view(),
+        name='post_comments'
+    ),
     path(
         '<int:pk>/comment/',
         views.CommentCreateView.as_view(),
@@ -58,6 +63,11 @@ urlpatterns = [
         views.UserProfileView.as_view(),
         name='profile'
     ),
+    path(
+        'search/',
+        views.SearchView.as_view(),
+        name='search'
+    ),
     path(
         'user/edit/',
         views.EditProfileView.as_view(),
@@ -1,20 +1,29 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count
+from django.db.models import Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.urls import reverse, reverse_lazy
 from django.views.generic import CreateView, DeleteView, DetailView, ListView
 from django.views.generic.edit import UpdateView
 from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
 
+from blog.cache import feed_scope, get_versions, version_time
 from blog.forms import CommentForm, EditProfileForm, PostForm
 from blog.mixins import (
     CommentAuthorCheckMixin,
     CommonMixin,
-    EditPostDispatchMixin
+    ConditionalGetMixin,
+    EditPostDispatchMixin,
+    StreamingListMixin
 )
-from blog.models import Category, Comment, Post
+from blog import registry
+from blog.models import Comment, Post
+from blog.paginators import CursorPaginator
+from blog.search import SearchResults, is_available as search_available
 
 User = get_user_model()
 
@@ -23,33 +32,97 @@ class IndexView(CommonMixin, ListView):
     pass
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, StreamingListMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
+    stream_item_template = 'includes/comment.html'
+    stream_item_name = 'comment'
+
+    def get_validators(self):
+        pk = self.kwargs['pk']
+        row = Post.objects.filter(pk=pk).values_list(
+            'updated_at',
+            'category__updated_at',
+            'location__updated_at',
+            'author_id',
+            'comment_count',
+            'is_published',
+            'pub_date',
+            'category_id',
+            'category__is_published',
+        ).first()
+        if row is None or not self.is_visible(*row[3:4], *row[5:]):
+            raise Http404('Такого поста не существует!')
+        row = row[:5]
+        comments_version, author_version = get_versions(
+            f'comments:{pk}', f'user:{row[3]}'
+        )
+        last_modified = max(filter(None, (
+            *row[:3],
+            version_time(comments_version),
+            version_time(author_version),
+        )))
+        return (
+            [
+                pk, *row, comments_version, author_version,
+                self.request.get_full_path(),
+            ],
+            last_modified,
+        )
+
+    def get_queryset(self):
+        return Post.objects.select_related('location', 'author', 'category')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
-        context['comments'] = post.comments.all().order_by('created_date')
+        context['comments'] = self.get_comments_page()
         context['form'] = CommentForm()
-        context['comment_count'] = post.comments.count()
+        context['comment_count'] = self.object.comment_count
         return context
 
+    def get_stream_items(self, context):
+        return context['comments']
+
+    def get_comments_page(self):
+        paginator = CursorPaginator(
+            self.object.comments.select_related('author'),
+            settings.COMMENTS_PER_PAGE,
+            field='created_date',
+            descending=False,
+        )
+        return paginator.page(self.request.GET.get('comments'))
+
     def get_object(self, queryset=None):
         post = super().get_object(queryset=queryset)
-        now = timezone.now()
-        if not (
-            post.author == self.request.user
-            or post.author != self.request.user
-            and (
-                post.is_published
-                and post.pub_date <= now
-                and post.category.is_published
-            )
+        if not self.is_visible(
+            post.author_id,
+            post.is_published,
+            post.pub_date,
+            post.category_id,
+            post.category_id is not None and post.category.is_published,
         ):
             raise Http404('Такого поста не существует!')
         return post
 
+    def is_visible(
+            self, author_id, is_published, pub_date, category_id,
+            category_is_published
+    ):
+        if author_id == self.request.user.pk:
+            return True
+        return bool(
+            is_published
+            and pub_date <= timezone.now()
+            and category_id is not None
+            and category_is_published
+        )
+
+
+class PostCommentsView(PostDetailView):
+    """Следующая порция комментариев публикации без остальной страницы."""
+
+    template_name = 'includes/comment_list.html'
+
 
 class CommentCreateView(LoginRequiredMixin, CreateView):
     model = Comment
@@ -67,15 +140,21 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
 class CategoryPostsView(CommonMixin, ListView):
     template_name = 'blog/category.html'
 
+    def get_page_cache_scope(self):
+        return feed_scope(category_slug=self.kwargs['category_slug'])
+
+    def get_validators(self):
+        if registry.published_category(self.kwargs['category_slug']) is None:
+            raise Http404('Категория не найдена.')
+        return super().get_validators()
+
     def get_queryset(self):
         queryset = super().get_queryset()
         category_slug = self.kwargs['category_slug']
-        self.category = get_object_or_404(
-            Category,
-            slug=category_slug,
-            is_published=True
-        )
-        queryset = queryset.filter(category=self.category)
+        self.category = registry.published_category(category_slug)
+        if self.category is None:
+            raise Http404('Категория не найдена.')
+        queryset = queryset.filter(category_id=self.category.pk)
         return queryset
 
     def get_context_data(self, **kwargs):
@@ -87,20 +166,22 @@ class CategoryPostsView(CommonMixin, ListView):
 class UserProfileView(CommonMixin, ListView):
     template_name = 'blog/profile.html'
 
+    @cached_property
+    def user(self):
+        return get_object_or_404(
+            User.objects.select_related('stats'),
+            username=self.kwargs['username']
+        )
+
+    def get_page_cache_scope(self):
+        return feed_scope(author_id=self.user.pk)
+
     def get_queryset(self):
         current_user = self.request.user
-        username = self.kwargs['username']
-        self.user = get_object_or_404(User, username=username)
-        queryset = Post.objects.select_related(
-            'location',
-            'author',
-            'category'
-        ).filter(
+        queryset = Post.objects.select_related('author').filter(
             author=self.user
         ).order_by(
             '-pub_date'
-        ).annotate(
-            comment_count=Count('comments')
         )
         if current_user == self.user:
             return queryset
@@ -114,6 +195,33 @@ class UserProfileView(CommonMixin, ListView):
         return context
 
 
+class SearchView(ListView):
+    template_name = 'blog/search.html'
+    paginate_by = settings.POSTS_PER_PAGE
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        visible = CommonMixin().get_queryset()
+        if not self.query:
+            return visible.none()
+        if not search_available():
+            return visible.filter(
+                Q(title__icontains=self.query) | Q(text__icontains=self.query)
+            )
+        return SearchResults(self.query, visible)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['page_query'] = urlencode({'q': self.query}) + '&'
+        page = context['page_obj']
+        page.object_list = registry.attach(list(page.object_list))
+        context['page_range'] = page.paginator.get_elided_page_range(
+            page.number
+        )
+        return context
+
+
 class CreatePostView(LoginRequiredMixin, CreateView):
     model = Post
     form_class = PostForm
@@ -156,7 +264,7 @@ class EditCommentView(
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'pk': self.object.post.id}
+            kwargs={'pk': self.object.post_id}
         )
 
 
@@ -203,5 +311,5 @@ class DeleteCommentView(
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'pk': self.object.post.id}
+            kwargs={'pk': self.object.post_id}
         )
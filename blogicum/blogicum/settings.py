@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -8,6 +10,18 @@ DEBUG = True
 
 POSTS_PER_PAGE = 10
 
+# Комментарии на странице публикации выводятся порциями, следующие
+# подгружаются по курсору.
+COMMENTS_PER_PAGE = 20
+
+# Курсорная пагинация лент: без OFFSET и COUNT(*), только ссылки
+# «назад» и «вперёд».
+FEED_CURSOR_PAGINATION = False
+
+# Потоковая отдача лент и комментариев: начало страницы уходит клиенту
+# до того, как выбраны и отрисованы все элементы списка.
+STREAMING_RESPONSES = False
+
 ALLOWED_HOSTS = []
 
 INSTALLED_APPS = [
@@ -24,6 +38,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.ProfilingMiddleware',
+    'blog.middleware.NPlusOneMiddleware',
+    'blog.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,9 +78,93 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    # Реплика только для чтения. Без REPLICA_DATABASE_NAME это второе
+    # подключение к той же базе; в тестах — зеркало тестовой базы.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('REPLICA_DATABASE_NAME', BASE_DIR / 'db.sqlite3'),
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+DATABASE_ROUTERS = ['blog.db.ReplicaRouter']
+
+# Алиасы реплик; пустой список отправляет все чтения в основную базу.
+DATABASE_REPLICAS = ['replica']
+
+# Страницы (имена маршрутов), которые на GET читают с реплики.
+REPLICA_READ_VIEWS = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+    'blog:post_comments',
+    'pages:about',
+    'pages:rules',
+)
+
+# Сколько секунд после записи клиент читает с основной базы.
+READ_YOUR_WRITES_SECONDS = 10
+
+# PRAGMA для каждого нового подключения SQLite (blog.db). Для разработки
+# настройки SQLite по умолчанию; боевые — в settings_production.
+SQLITE_PRAGMAS = {}
+
+# Файловый кэш из blog.cache_backends пишет за O(1): в отличие от
+# FileBasedCache Django он не перечисляет каталог на каждой записи.
+SHARED_CACHE_BACKEND = os.getenv(
+    'SHARED_CACHE_BACKEND', 'blog.cache_backends.FileBasedCache'
+)
+
+CACHES = {
+    # Содержимое (карточки, страницы, справочники) можно держать в памяти
+    # процесса: его ключи зависят от версий из кэша shared.
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Общий для всех процессов кэш: версии ключей, граница отложенных
+    # публикаций, наличие копий изображений. Их меняют и веб-процессы, и
+    # apply_changes с process_image_jobs, поэтому кэш в памяти процесса
+    # здесь не годится. Файлы подходят для одного сервера; для нескольких
+    # нужен memcached (SHARED_CACHE_BACKEND=
+    # django.core.cache.backends.memcached.PyMemcacheCache).
+    'shared': {
+        'BACKEND': SHARED_CACHE_BACKEND,
+        'LOCATION': os.getenv(
+            'SHARED_CACHE_LOCATION',
+            os.path.join(tempfile.gettempdir(), 'blogicum-shared'),
+        ),
+        # Файловый кэш по умолчанию хранит лишь 300 записей, а версия
+        # заводится на каждую публикацию.
+        'OPTIONS': (
+            {'MAX_ENTRIES': 10 ** 6}
+            if SHARED_CACHE_BACKEND.endswith('FileBasedCache') else {}
+        ),
+    },
+    # Для хранения на диске: FEED_PAGE_CACHE_BACKEND=
+    # django.core.cache.backends.filebased.FileBasedCache
+    # и FEED_PAGE_CACHE_LOCATION=/путь/к/каталогу.
+    'feed_pages': {
+        'BACKEND': os.getenv(
+            'FEED_PAGE_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('FEED_PAGE_CACHE_LOCATION', 'feed-pages'),
+    },
+}
+
+FEED_PAGE_CACHE_ALIAS = 'feed_pages'
+
+SHARED_CACHE_ALIAS = 'shared'
+
+FEED_PAGE_CACHE_TIMEOUT = 60 * 10
+
+# Браузер нельзя уведомить об изменениях, поэтому срок короче.
+FEED_BROWSER_CACHE_TIMEOUT = 60
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -123,3 +224,27 @@ CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+# Профилирование запросов: журнал JSON lines для команды profile_report.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') == '1'
+
+PROFILING_LOG_FILE = os.environ.get(
+    'PROFILING_LOG_FILE', BASE_DIR / 'profiling.jsonl'
+)
+
+PROFILING_SAMPLE_RATE = 0.05
+
+PROFILING_SLOW_MS = 500
+
+# Поиск N+1: одинаковый по форме запрос из одного места кода повторяется
+# N_PLUS_ONE_THRESHOLD раз за запрос. В тестах это ошибка, при разработке —
+# предупреждение в логе blog.middleware. Детектор разбирает стек на каждом
+# запросе к базе, поэтому в работе он проверяет лишь долю запросов
+# N_PLUS_ONE_SAMPLE_RATE.
+N_PLUS_ONE_DETECTION = True
+
+N_PLUS_ONE_SAMPLE_RATE = 1.0
+
+N_PLUS_ONE_THRESHOLD = 5
+
+N_PLUS_ONE_RAISE = False
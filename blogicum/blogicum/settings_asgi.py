@@ -0,0 +1,21 @@
+"""Настройки для запуска под ASGI-сервером.
+
+    DJANGO_SETTINGS_MODULE=blogicum.settings_asgi \
+        uvicorn blogicum.asgi:application --workers 4
+
+Страницы чтения обслуживают асинхронные представления из
+`blog.async_views`. Debug Toolbar и поиск N+1 умеют работать только
+синхронно и заставили бы Django переключаться между потоками на каждом
+запросе, поэтому их middleware здесь отключены. Поиск N+1 к тому же не
+видит запросов из потоков `sync_to_async(thread_sensitive=False)`.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE
+
+ROOT_URLCONF = 'blogicum.urls_async'
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar.')
+    and middleware != 'blog.middleware.NPlusOneMiddleware'
+]
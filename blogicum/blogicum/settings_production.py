@@ -0,0 +1,91 @@
+"""Боевые настройки для SQLite.
+
+    DJANGO_SETTINGS_MODULE=blogicum.settings_production \
+        gunicorn blogicum.wsgi --workers 4 --threads 4
+
+Рядом с веб-процессами постоянно должны работать две фоновые команды
+с теми же настройками:
+
+    python manage.py apply_changes --loop
+    python manage.py process_image_jobs
+
+Первая применяет журнал изменений: обновляет поисковый индекс FTS5, в
+том числе названия категорий и мест у их публикаций, пересчитывает
+счётчики комментариев и сбрасывает ленты категорий и авторов. Вторая
+убирает метаданные из загруженных изображений и создаёт их копии.
+Если команды остановлены, сайт работает, но поиск, ленты и картинки
+отстают от изменений; размер очереди журнала показывает
+`apply_changes --lag`.
+
+WAL позволяет читать, пока идёт запись, а busy_timeout заставляет
+писателя подождать блокировку вместо ошибки «database is locked».
+При synchronous=NORMAL в режиме WAL fsync выполняется только при
+контрольной точке: после сбоя питания могут потеряться последние
+транзакции, но база остаётся целой. Подключения живут CONN_MAX_AGE
+секунд и переиспользуются между запросами одного потока.
+
+Версии ключей и страницы ленты лежат в файловом кэше в каталоге
+CACHE_DIR, общем для воркеров gunicorn и фоновых команд: сброс версии
+должны видеть все процессы, а страница, собранная одним воркером,
+пригодится остальным. Карточки остаются в памяти процесса: их ключи
+содержат общие версии. При systemd с PrivateTmp или нескольких серверах
+CACHE_DIR (или SHARED_CACHE_BACKEND и SHARED_CACHE_LOCATION для
+memcached) нужно задать явно.
+
+Сравнение с настройками по умолчанию:
+`python -m benchmarks.sqlite_concurrency`.
+"""
+import os
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+from .settings import CACHES, DATABASES, MIDDLEWARE
+
+DEBUG = False
+
+N_PLUS_ONE_SAMPLE_RATE = float(os.getenv('N_PLUS_ONE_SAMPLE_RATE', '0.01'))
+
+ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost').split(',')
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar.')
+]
+
+CONN_MAX_AGE = 600
+
+DATABASES = {
+    alias: {**config, 'CONN_MAX_AGE': CONN_MAX_AGE}
+    for alias, config in DATABASES.items()
+}
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    # 256 МБ файла базы читаются через mmap, без копирования в кэш.
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер кэша страниц в КиБ (64 МБ).
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+CACHE_DIR = os.getenv(
+    'CACHE_DIR', os.path.join(tempfile.gettempdir(), 'blogicum')
+)
+
+
+CACHES = {
+    **CACHES,
+    'shared': {
+        **CACHES['shared'],
+        'LOCATION': os.getenv(
+            'SHARED_CACHE_LOCATION', os.path.join(CACHE_DIR, 'shared')
+        ),
+    },
+    'feed_pages': {
+        'BACKEND': 'blog.cache_backends.FileBasedCache',
+        'LOCATION': os.path.join(CACHE_DIR, 'feed-pages'),
+        'OPTIONS': {'MAX_ENTRIES': 10 ** 4},
+    },
+}
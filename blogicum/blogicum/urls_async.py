@@ -0,0 +1,45 @@
+"""Маршруты для ASGI: страницы чтения обслуживают асинхронные представления.
+
+Остальные маршруты (формы, админка, авторизация) те же, что в
+`blogicum.urls`.
+"""
+from django.urls import include, path
+
+from blog import async_views
+from blog import urls as blog_urls
+from blogicum import urls as sync_urls
+
+handler404 = sync_urls.handler404
+handler500 = sync_urls.handler500
+
+blog_urlpatterns = [
+    path('', async_views.index, name='index'),
+    path(
+        'category/<slug:category_slug>/',
+        async_views.category_posts,
+        name='category_posts'
+    ),
+    path('profile/<str:username>/', async_views.profile, name='profile'),
+    path('posts/<int:pk>/', async_views.post_detail, name='post_detail'),
+    path(
+        'posts/<int:pk>/comments/',
+        async_views.post_comments,
+        name='post_comments'
+    ),
+    # Синхронные маршруты ниже перекрыты асинхронными с тем же адресом.
+    *blog_urls.urlpatterns,
+]
+
+pages_urlpatterns = [
+    path('about/', async_views.about, name='about'),
+    path('rules/', async_views.rules, name='rules'),
+]
+
+urlpatterns = [
+    path('pages/', include((pages_urlpatterns, 'pages'))),
+    path('', include((blog_urlpatterns, 'blog'))),
+    *(
+        pattern for pattern in sync_urls.urlpatterns
+        if getattr(pattern, 'namespace', None) not in ('blog', 'pages')
+    ),
+]
@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +42,39 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def raise_on_n_plus_one(settings):
+    settings.N_PLUS_ONE_RAISE = True
+
+
+@pytest.fixture(autouse=True)
+def no_replicas(settings):
+    # Реплика-зеркало не видит данных незакоммиченной транзакции теста;
+    # маршрутизацию проверяет test_replicas.py.
+    settings.DATABASE_REPLICAS = []
+
+
+@pytest.fixture(autouse=True, scope='session')
+def shared_cache_location(tmp_path_factory):
+    # Не трогаем общий кэш сервера разработки на той же машине.
+    from django.conf import settings
+
+    location = str(tmp_path_factory.mktemp('shared-cache'))
+    caches_setting = {
+        **settings.CACHES,
+        'shared': {**settings.CACHES['shared'], 'LOCATION': location},
+    }
+    with override_settings(CACHES=caches_setting):
+        yield location
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -363,6 +397,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
@@ -0,0 +1,84 @@
+import pytest
+from django.contrib.admin.models import LogEntry
+
+from blog.models import Category, Post
+
+
+def run_action(admin_client, url, action, objects, **data):
+    return admin_client.post(url, {
+        'action': action,
+        '_selected_action': [obj.pk for obj in objects],
+        **data,
+    })
+
+
+@pytest.mark.django_db
+def test_post_bulk_actions_single_update(
+        admin_client, django_assert_max_num_queries, mixer, user,
+        published_category, another_category, published_location
+):
+    posts = mixer.cycle(30).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True
+    )
+    LogEntry.objects.all().delete()
+    with django_assert_max_num_queries(20):
+        run_action(admin_client, '/admin/blog/post/', 'unpublish', posts)
+    assert not Post.objects.filter(is_published=True).exists()
+    assert LogEntry.objects.count() == 1, (
+        'Убедитесь, что массовое действие пишет одну запись в журнал'
+        ' админки.'
+    )
+
+    run_action(
+        admin_client, '/admin/blog/post/', 'move_to_category', posts[:5],
+        category=another_category.pk
+    )
+    run_action(
+        admin_client, '/admin/blog/post/', 'reassign_location', posts[:5],
+        location=published_location.pk
+    )
+    moved = Post.objects.filter(
+        category=another_category, location=published_location
+    )
+    assert moved.count() == 5
+
+
+@pytest.mark.django_db
+def test_bulk_action_invalidates_feed(
+        admin_client, client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in client.get('/').content.decode()
+    run_action(admin_client, '/admin/blog/category/', 'unpublish', [
+        post.category
+    ])
+    assert not Category.objects.get(pk=post.category.pk).is_published
+    assert post.title not in client.get('/').content.decode(), (
+        'Убедитесь, что массовое действие сбрасывает кэш лент.'
+    )
+
+
+@pytest.mark.django_db
+def test_move_requires_category(admin_client, post_with_published_location):
+    post = post_with_published_location
+    category = post.category
+    run_action(admin_client, '/admin/blog/post/', 'move_to_category', [post])
+    post.refresh_from_db()
+    assert post.category == category
+
+
+@pytest.mark.django_db
+def test_action_form_does_not_list_locations(
+        admin_client, mixer, post_with_published_location
+):
+    locations = mixer.cycle(3).blend('blog.Location')
+    content = admin_client.get('/admin/blog/post/').content.decode()
+    assert 'name="location" class="vForeignKeyRawIdAdminField"' in content
+    assert all(
+        f'<option value="{location.pk}"' not in content
+        for location in locations
+    ), (
+        'Убедитесь, что форма действий не выводит все местоположения'
+        ' списком.'
+    )
@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+
+from blog.images import variant_name, variant_url
+from blog.models import Post
+from blog.paginators import EstimatedCountPaginator, estimated_rows
+
+
+@pytest.mark.django_db
+def test_post_changelist_queries_do_not_grow(
+        admin_client, django_assert_max_num_queries, mixer, user,
+        published_category, published_location
+):
+    mixer.cycle(20).blend(
+        'blog.Post', category=published_category,
+        location=published_location, author=mixer.SELECT
+    )
+    mixer.cycle(20).blend('auth.User')
+    with django_assert_max_num_queries(12):
+        response = admin_client.get('/admin/blog/post/')
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert f'?author__id__exact={user.pk}' not in content, (
+        'Убедитесь, что фильтр по автору не перечисляет всех пользователей.'
+    )
+    assert 'name="author"' in content
+    assert admin_client.get('/admin/blog/post/add/').status_code == 200
+
+
+@pytest.mark.django_db
+def test_post_changelist_input_filters(admin_client, mixer, user, another_user):
+    post = mixer.blend('blog.Post', author=user)
+    mixer.blend('blog.Post', author=another_user)
+    response = admin_client.get(
+        '/admin/blog/post/', {'author': user.username}
+    )
+    assert list(response.context['cl'].result_list) == [post]
+
+
+@pytest.mark.django_db
+def test_estimated_count_paginator(mixer, user):
+    mixer.cycle(5).blend('blog.Post', author=user)
+    paginator = EstimatedCountPaginator(Post.objects.order_by('pk'), 2)
+    paginator.exact_limit = 3
+    assert paginator.count >= 3
+    paginator = EstimatedCountPaginator(Post.objects.order_by('pk'), 2)
+    assert paginator.count == 5
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        paginator = EstimatedCountPaginator(Post.objects.order_by('pk'), 2)
+        paginator.exact_limit = 3
+        assert paginator.count == 5, (
+            'Убедитесь, что для большой таблицы берётся оценка из'
+            ' статистики СУБД.'
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Статистика sqlite_stat1.'
+)
+def test_estimated_rows_skips_partial_indexes(mixer, user):
+    mixer.blend('blog.Post', author=user, is_published=True)
+    mixer.cycle(4).blend('blog.Post', author=user, is_published=False)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+        assert estimated_rows(Post) == 5
+        cursor.execute(
+            'DELETE FROM sqlite_stat1 WHERE tbl = %s AND idx NOT IN ('
+            'SELECT name FROM pragma_index_list(%s) WHERE partial)',
+            [Post._meta.db_table] * 2,
+        )
+    assert estimated_rows(Post) is None, (
+        'Убедитесь, что оценка не берётся из статистики частичного индекса.'
+    )
+
+
+def test_variant_url_is_cached(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    path = tmp_path / variant_name('photo.jpg', 'card')
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b'jpg')
+    assert variant_url('photo.jpg', 'card')
+    path.unlink()
+    assert variant_url('photo.jpg', 'card'), (
+        'Убедитесь, что наличие копии изображения кэшируется.'
+    )
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve
+
+from blog.mixins import StreamingListMixin
+
+
+@pytest.fixture
+def async_urls(settings):
+    settings.ROOT_URLCONF = 'blogicum.urls_async'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_pages_served_by_async_views(
+        async_urls, client, user, post_with_published_location
+):
+    post = post_with_published_location
+    urls = [
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{user.username}/',
+        f'/posts/{post.pk}/',
+        '/pages/about/',
+        '/pages/rules/',
+    ]
+    for url in urls:
+        assert asyncio.iscoroutinefunction(resolve(url).func), (
+            f'Убедитесь, что страница `{url}` в режиме ASGI обслуживается'
+            ' асинхронным представлением.'
+        )
+
+    async def fetch_all():
+        async_client = AsyncClient()
+        return await asyncio.gather(*(async_client.get(url) for url in urls))
+
+    responses = async_to_sync(fetch_all)()
+    for url, response in zip(urls, responses):
+        assert response.status_code == 200, url
+        assert response.content == client.get(url).content, (
+            f'Убедитесь, что асинхронная страница `{url}` совпадает с'
+            ' синхронной.'
+        )
+    assert resolve('/posts/create/').func.view_class.__name__ == (
+        'CreatePostView'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_do_not_stream(
+        async_urls, monkeypatch, post_with_published_location
+):
+    monkeypatch.setattr(StreamingListMixin, 'streaming', True)
+    response = async_to_sync(AsyncClient().get)('/')
+    assert not response.streaming, (
+        'Убедитесь, что асинхронные представления не используют потоковую'
+        ' отдачу: генератор читал бы базу из цикла событий.'
+    )
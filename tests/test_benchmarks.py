@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks.compare import compare
+from benchmarks.routes import build_routes, missing_routes
+from benchmarks.run import make_clients, percentile, run_client
+from benchmarks.seed import SCALES, seed
+
+
+@pytest.mark.django_db
+def test_benchmark_covers_all_routes(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    dataset = seed(SCALES['tiny'])
+    routes = build_routes(dataset)
+    assert missing_routes(routes) == [], (
+        'Убедитесь, что в замере есть каждый маршрут blog и pages.'
+    )
+    report = run_client(routes, make_clients(dataset), repeat=1)
+    assert set(report) == {route.label for route in routes}
+    assert all(
+        {'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'bytes'} <= set(result)
+        for result in report.values()
+    )
+
+
+def test_percentile_and_compare():
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile([1, 2, 3, 4], 99) == 4
+    before = {'client': {'GET index': {'p95_ms': 10.0, 'queries': 3}}}
+    after = {'client': {'GET index': {'p95_ms': 10.5, 'queries': 4}}}
+    assert compare(before, after, threshold=10)[1], (
+        'Убедитесь, что рост числа запросов считается регрессией.'
+    )
+    assert not compare(before, before, threshold=10)[1]
@@ -0,0 +1,95 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from blog import changelog
+from blog.changelog import apply_pending, lag
+from blog.models import ChangeLog, Post
+
+
+@pytest.mark.django_db
+def test_category_change_is_logged_not_fanned_out(
+        django_assert_max_num_queries, mixer, user, published_category
+):
+    mixer.cycle(5).blend('blog.Post', author=user, category=published_category)
+    apply_pending()
+    published_category.is_published = False
+    with django_assert_max_num_queries(4):
+        published_category.save()
+    assert ChangeLog.objects.filter(
+        kind=ChangeLog.CATEGORY, object_id=published_category.pk
+    ).exists(), (
+        'Убедитесь, что изменение категории записывается в журнал, а не'
+        ' обрабатывается синхронно для всех её публикаций.'
+    )
+
+
+@pytest.mark.django_db
+def test_apply_pending_in_batches_and_idempotent(
+        mixer, user, published_category
+):
+    posts = mixer.cycle(5).blend(
+        'blog.Post', author=user, category=published_category
+    )
+    mixer.cycle(2).blend('blog.Comment', post=posts[0], author=user)
+    Post.objects.filter(pk=posts[0].pk).update(comment_count=10)
+    pending, _ = lag()
+    assert pending > 2
+
+    applied = apply_pending(batch_size=2)
+    assert applied == 2
+    assert lag()[0] == pending - 2, (
+        'Убедитесь, что за один проход применяется не больше batch_size'
+        ' записей.'
+    )
+    while apply_pending(batch_size=2):
+        pass
+    posts[0].refresh_from_db()
+    assert posts[0].comment_count == 2
+    assert lag() == (0, None)
+
+    ChangeLog.objects.create(kind=ChangeLog.POST, object_id=posts[1].pk)
+    apply_pending()
+    apply_pending()
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT count(*) FROM blog_post_fts WHERE rowid = %s',
+                [posts[1].pk],
+            )
+            assert cursor.fetchone()[0] == 1
+
+
+@pytest.mark.django_db
+def test_apply_changes_command(mixer, user, published_category):
+    mixer.blend('blog.Post', author=user, category=published_category)
+    out = StringIO()
+    call_command('apply_changes', '--lag', stdout=out)
+    assert 'В очереди' in out.getvalue()
+    assert ChangeLog.objects.exists()
+    call_command('apply_changes', stdout=StringIO())
+    assert not ChangeLog.objects.exists()
+
+
+@pytest.mark.django_db
+def test_versions_bumped_after_commit(
+        monkeypatch, mixer, user, published_category
+):
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    mixer.blend('blog.Comment', post=post, author=user)
+    depth = len(connection.savepoint_ids)
+    bumps = []
+
+    def bump_feeds(feeds):
+        bumps.append(len(connection.savepoint_ids))
+
+    monkeypatch.setattr(changelog, 'bump_feeds', bump_feeds)
+    published_category.title = 'Новое название'
+    published_category.save()
+    apply_pending()
+    assert bumps and set(bumps) == {depth}, (
+        'Убедитесь, что `apply_pending` сбрасывает версии после фиксации'
+        ' транзакции.'
+    )
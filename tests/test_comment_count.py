@@ -0,0 +1,42 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+        mixer, user, post_with_published_location, another_category
+):
+    post = post_with_published_location
+    other_post = mixer.blend(
+        'blog.Post', author=user, category=another_category
+    )
+    comments = mixer.cycle(3).blend('blog.Comment', post=post, author=user)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        'Убедитесь, что при создании комментария увеличивается счётчик'
+        ' комментариев публикации.'
+    )
+
+    comments[0].delete()
+    comments[1].post = other_post
+    comments[1].save()
+    post.refresh_from_db()
+    other_post.refresh_from_db()
+    assert (post.comment_count, other_post.comment_count) == (1, 1), (
+        'Убедитесь, что счётчик комментариев учитывает удаление комментария'
+        ' и его перенос к другой публикации.'
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(mixer, user, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post, author=user)
+    Post.objects.update(comment_count=100)
+    call_command('recount_comments', stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == Comment.objects.filter(post=post).count()
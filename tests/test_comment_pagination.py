@@ -0,0 +1,58 @@
+import re
+
+import pytest
+from django.db import connection
+
+from blog.models import Comment
+
+
+@pytest.fixture
+def many_comments(settings, mixer, user, post_with_published_location):
+    settings.COMMENTS_PER_PAGE = 3
+    return mixer.cycle(7).blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+
+
+def shown_comments(content):
+    return [int(pk) for pk in re.findall(r'name="comment_(\d+)"', content)]
+
+
+@pytest.mark.django_db
+def test_detail_renders_first_batch_of_comments(
+        client, many_comments, post_with_published_location
+):
+    post = post_with_published_location
+    expected = [
+        comment.pk for comment in
+        Comment.objects.filter(post=post).order_by('created_date', 'pk')
+    ]
+    content = client.get(f'/posts/{post.pk}/').content.decode()
+    assert shown_comments(content) == expected[:3], (
+        'Убедитесь, что страница публикации показывает только первую порцию'
+        ' комментариев.'
+    )
+
+    seen = shown_comments(content)
+    while True:
+        match = re.search(r'data-fragment="([^"]+)"', content)
+        if not match:
+            break
+        content = client.get(match.group(1).replace('&amp;', '&'))
+        content = content.content.decode()
+        assert '<form' not in content
+        seen += shown_comments(content)
+    assert seen == expected, (
+        'Убедитесь, что фрагменты по курсору выдают оставшиеся комментарии'
+        ' по порядку и без повторов.'
+    )
+
+
+@pytest.mark.django_db
+def test_comment_index_used():
+    if connection.vendor != 'sqlite':
+        pytest.skip('План запроса SQLite.')
+    plan = Comment.objects.filter(post_id=1).order_by(
+        'created_date', 'id'
+    )[:20].explain()
+    assert 'comment_post_created_idx' in plan and 'TEMP B-TREE' not in plan
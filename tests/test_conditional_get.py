@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+import pytest
+
+
+def revalidate(client, url, response):
+    return client.get(
+        url,
+        HTTP_IF_NONE_MATCH=response['ETag'],
+        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_not_modified(
+        mixer, client, user, post_with_published_location,
+        django_assert_num_queries
+):
+    url = f'/posts/{post_with_published_location.id}/'
+    response = client.get(url)
+    assert response.has_header('ETag') and response.has_header(
+        'Last-Modified'
+    )
+    with django_assert_num_queries(1):
+        not_modified = revalidate(client, url, response)
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что страница публикации отвечает 304 Not Modified, если'
+        ' у клиента актуальная версия.'
+    )
+
+    comment = mixer.blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+    response = revalidate(client, url, response)
+    assert response.status_code == HTTPStatus.OK
+    comment.text = 'Новый текст комментария'
+    comment.save()
+    assert revalidate(client, url, response).status_code == HTTPStatus.OK, (
+        'Убедитесь, что ETag страницы публикации меняется при редактировании'
+        ' комментария.'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('logged_in', [False, True])
+def test_feed_not_modified(
+        client, user_client, post_with_published_location, logged_in
+):
+    client = user_client if logged_in else client
+    response = client.get('/')
+    assert revalidate(client, '/', response).status_code == (
+        HTTPStatus.NOT_MODIFIED
+    )
+
+    post_with_published_location.title = 'Новый заголовок'
+    post_with_published_location.save()
+    response = revalidate(client, '/', response)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Новый заголовок' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_feed_etag_depends_on_user(
+        client, user_client, post_with_published_location
+):
+    response = user_client.get('/')
+    assert revalidate(client, '/', response).status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_hidden_post_is_not_revalidated(client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    response = client.get(url)
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    assert revalidate(client, url, response).status_code == (
+        HTTPStatus.NOT_FOUND
+    ), (
+        'Убедитесь, что снятая с публикации запись отвечает 404, даже если'
+        ' у клиента сохранён её ETag.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_etag_depends_on_csrf_token(
+        settings, user_client, post_with_published_location
+):
+    url = f'/posts/{post_with_published_location.id}/'
+    response = user_client.get(url)
+    assert revalidate(user_client, url, response).status_code == (
+        HTTPStatus.NOT_MODIFIED
+    )
+    del user_client.cookies[settings.CSRF_COOKIE_NAME]
+    assert revalidate(user_client, url, response).status_code == (
+        HTTPStatus.OK
+    ), (
+        'Убедитесь, что ETag страницы с формой меняется вместе с'
+        ' CSRF-токеном.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_etag_depends_on_path(client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    response = client.get(url)
+    for other_url in (f'{url}?comments=', f'{url}comments/'):
+        assert revalidate(client, other_url, response).status_code == (
+            HTTPStatus.OK
+        ), (
+            'Убедитесь, что страница публикации, порция комментариев и'
+            ' фрагмент списка комментариев имеют разные ETag.'
+        )
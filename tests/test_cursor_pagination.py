@@ -0,0 +1,44 @@
+import pytest
+
+from blog.mixins import CommonMixin
+
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def cursor_pagination(monkeypatch):
+    monkeypatch.setattr(CommonMixin, 'cursor_pagination', True)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cursor_pagination')
+def test_cursor_pagination_walks_feed(
+        client, many_posts_with_published_locations
+):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    seen = []
+    pages = []
+    url = '/'
+    while url:
+        page = client.get(url).context['page_obj']
+        pages.append(page)
+        seen.extend(page)
+        url = f'/?cursor={page.next_cursor}' if page.has_next() else None
+    assert seen == expected, (
+        'Убедитесь, что курсорная пагинация проходит ленту без пропусков и'
+        ' повторов в порядке убывания даты публикации.'
+    )
+    assert all(len(page) <= N_PER_PAGE for page in pages)
+
+    previous = client.get(f'/?cursor={pages[-1].previous_cursor}')
+    assert list(previous.context['page_obj']) == list(pages[-2])
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cursor_pagination')
+def test_cursor_pagination_rejects_broken_cursor(client):
+    assert client.get('/?cursor=broken').status_code == 404
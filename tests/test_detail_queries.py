@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('comments_count', [1, 15])
+def test_post_detail_query_count(
+        mixer, unlogged_client, post_with_published_location,
+        comments_count, django_assert_num_queries
+):
+    post = post_with_published_location
+    mixer.cycle(comments_count).blend('blog.Comment', post=post)
+    # Данные для ETag, публикация с автором, категорией и местом и список
+    # комментариев с их авторами.
+    with django_assert_num_queries(3):
+        response = unlogged_client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_post_detail_query_count_for_user(
+        mixer, another_user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend('blog.Comment', post=post)
+    # Сессия и пользователь, затем те же запросы, что и для гостя.
+    with django_assert_num_queries(5):
+        response = another_user_client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200
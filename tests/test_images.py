@@ -0,0 +1,193 @@
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import generate_variants, variant_name
+from blog.jobs import RUNNING_TIMEOUT, process_pending
+from blog.models import ImageJob
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def make_image(size, name='photo.jpg'):
+    data = BytesIO()
+    Image.new('RGB', size, 'skyblue').save(data, 'JPEG')
+    return SimpleUploadedFile(name, data.getvalue(), 'image/jpeg')
+
+
+@pytest.fixture
+def post_with_image(media_root, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        image=make_image((1600, 1200)),
+    )
+    process_pending()
+    return post
+
+
+@pytest.mark.django_db
+def test_variants_created_on_upload(post_with_image):
+    name = post_with_image.image.name
+    expected = {
+        'admin': (50, 50),
+        'card': (640, 480),
+        'detail': (1280, 960),
+    }
+    for variant, size in expected.items():
+        for webp in (False, True):
+            target = variant_name(name, variant, webp)
+            assert default_storage.exists(target), (
+                f'Убедитесь, что при загрузке создаётся копия `{target}`.'
+            )
+            with default_storage.open(target) as file:
+                assert Image.open(file).size == size
+
+
+@pytest.mark.django_db
+def test_small_image_has_no_variants(media_root, mixer, user):
+    post = mixer.blend('blog.Post', author=user, image=make_image((40, 40)))
+    process_pending()
+    assert not default_storage.exists(
+        variant_name(post.image.name, 'card')
+    )
+
+
+@pytest.mark.django_db
+def test_templates_use_variants(client, post_with_image):
+    name = post_with_image.image.name
+    card = client.get('/').content.decode()
+    assert default_storage.url(variant_name(name, 'card')) in card
+    assert 'srcset=' in card and 'image/webp' in card
+
+    detail = client.get(f'/posts/{post_with_image.id}/').content.decode()
+    assert f'src="{default_storage.url(variant_name(name, "detail"))}"' in (
+        detail
+    )
+
+
+@pytest.mark.django_db
+def test_variants_replaced_with_image(post_with_image):
+    old_name = post_with_image.image.name
+    post_with_image.image = make_image((800, 600), 'other.jpg')
+    post_with_image.save()
+    assert not default_storage.exists(variant_name(old_name, 'card'))
+    process_pending()
+    assert default_storage.exists(
+        variant_name(post_with_image.image.name, 'card')
+    )
+
+
+@pytest.mark.django_db
+def test_upload_only_enqueues_job(client, media_root, mixer, user,
+                                  published_category):
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        image=make_image((1600, 1200)),
+    )
+    name = post.image.name
+    assert not default_storage.exists(variant_name(name, 'card')), (
+        'Убедитесь, что копии изображения создаются в фоне, а не при'
+        ' сохранении публикации.'
+    )
+    assert default_storage.url(name) in client.get('/').content.decode()
+
+    assert process_pending() == 1
+    assert ImageJob.objects.get(post=post).status == ImageJob.DONE
+    assert default_storage.url(variant_name(name, 'card')) in (
+        client.get('/').content.decode()
+    ), 'Убедитесь, что после обработки лента показывает копию изображения.'
+
+
+@pytest.mark.django_db
+def test_job_strips_exif(media_root, mixer, user):
+    image = Image.new('RGB', (100, 50))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    data = BytesIO()
+    image.save(data, 'JPEG', exif=exif)
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        image=SimpleUploadedFile('rotated.jpg', data.getvalue()),
+    )
+    process_pending()
+    with default_storage.open(post.image.name) as file:
+        stripped = Image.open(file)
+        assert 'exif' not in stripped.info
+        assert stripped.size == (50, 100)
+
+
+@pytest.mark.django_db
+def test_job_keeps_source_format(media_root, mixer, user):
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    data = BytesIO()
+    Image.new('RGB', (800, 400)).save(data, 'WEBP', exif=exif)
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        image=SimpleUploadedFile('rotated.webp', data.getvalue()),
+    )
+    process_pending()
+    name = post.image.name
+    with default_storage.open(name) as file:
+        stripped = Image.open(file)
+        assert (stripped.format, stripped.size) == ('WEBP', (400, 800)), (
+            'Убедитесь, что оригинал без метаданных остаётся в своём формате.'
+        )
+    with default_storage.open(variant_name(name, 'admin')) as file:
+        assert Image.open(file).format == 'WEBP', (
+            'Убедитесь, что копия сохраняет формат оригинала.'
+        )
+
+
+@pytest.mark.django_db
+def test_variants_do_not_replace_other_files(media_root):
+    assert variant_name('posts_images/cat.jpg', 'card', webp=True) != (
+        variant_name('posts_images/cat.png', 'card', webp=True)
+    ), 'Убедитесь, что копии файлов с разными расширениями не совпадают.'
+    foreign = default_storage.save('posts_images/cat.card.jpg', make_image(
+        (700, 500), name='cat.card.jpg'
+    ))
+    original = default_storage.save('posts_images/cat.jpg', make_image(
+        (1600, 1200), name='cat.jpg'
+    ))
+    created = generate_variants(original)
+    assert created and all(
+        not name.startswith('posts_images/') for name in created
+    )
+    with default_storage.open(foreign) as file:
+        assert Image.open(file).size == (700, 500), (
+            'Убедитесь, что создание копий не затирает чужие файлы.'
+        )
+
+
+@pytest.mark.django_db
+def test_stale_running_job_is_reclaimed(media_root, mixer, user):
+    post = mixer.blend('blog.Post', author=user, image=make_image((800, 600)))
+    job = ImageJob.objects.get(post=post)
+    ImageJob.objects.filter(pk=job.pk).update(
+        status=ImageJob.RUNNING,
+        attempts=1,
+        started_at=timezone.now() - RUNNING_TIMEOUT - timedelta(seconds=1),
+    )
+    assert process_pending() == 1, (
+        'Убедитесь, что задача, зависшая в статусе «Выполняется», снова'
+        ' попадает в очередь.'
+    )
+    job.refresh_from_db()
+    assert job.status == ImageJob.DONE
+    assert default_storage.exists(variant_name(post.image.name, 'card'))
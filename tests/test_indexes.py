@@ -0,0 +1,36 @@
+import pytest
+from django.db import connection
+
+from blog.mixins import CommonMixin
+from blog.models import Post
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='План запроса SQLite.'
+)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ('filters', 'public', 'index_name'),
+    [
+        ({}, True, 'post_feed_idx'),
+        ({'category_id': 1}, True, 'post_category_feed_idx'),
+        ({'author_id': 1}, True, 'post_author_feed_idx'),
+        ({'author_id': 1}, False, 'post_author_feed_idx'),
+    ],
+    ids=['index', 'category', 'profile', 'own profile'],
+)
+def test_feed_queries_use_indexes(filters, public, index_name):
+    queryset = (
+        CommonMixin().get_queryset() if public
+        else Post.objects.order_by('-pub_date')
+    )
+    plan = queryset.filter(**filters)[:10].explain()
+    assert f'USING INDEX {index_name}' in plan, (
+        f'Убедитесь, что запрос ленты использует индекс `{index_name}`.'
+        f' План запроса:\n{plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        'Убедитесь, что лента сортируется по индексу, без временной'
+        f' сортировки. План запроса:\n{plan}'
+    )
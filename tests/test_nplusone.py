@@ -0,0 +1,149 @@
+import logging
+
+import pytest
+from django.db import connection, transaction
+from django.db.models.signals import pre_delete
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from blog.middleware import NPlusOneMiddleware
+from blog.models import Comment, Post
+from blog.nplusone import NPlusOneError, query_shape, watch
+
+
+def test_query_shape_hides_literals():
+    assert query_shape(
+        "SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  AND n = 3"
+    ) == query_shape(
+        "SELECT * FROM t WHERE id IN (%s) AND name = 'y' AND n = 42"
+    ), 'Убедитесь, что форма запроса не зависит от значений параметров.'
+
+
+@pytest.mark.django_db
+def test_watch_finds_lazy_relations(mixer, user, post_with_published_location):
+    mixer.cycle(6).blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+    with watch() as detector:
+        for comment in Comment.objects.all():
+            comment.author.username
+    assert len(detector.repeated()) == 1, (
+        'Убедитесь, что ленивое обращение к связи в цикле находится.'
+    )
+    with watch() as detector:
+        for comment in Comment.objects.select_related('author'):
+            comment.author.username
+    assert not detector.repeated()
+
+
+def lazy_view(request):
+    return HttpResponse(
+        ' '.join(comment.post.title for comment in Comment.objects.all())
+    )
+
+
+@pytest.mark.django_db
+def test_middleware_raises_or_logs(
+        settings, caplog, mixer, user, post_with_published_location
+):
+    mixer.cycle(6).blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+    request = RequestFactory().get('/lazy/')
+    with pytest.raises(NPlusOneError):
+        NPlusOneMiddleware(lazy_view)(request)
+    settings.N_PLUS_ONE_RAISE = False
+    with caplog.at_level(logging.WARNING, logger='blog.middleware'):
+        response = NPlusOneMiddleware(lazy_view)(request)
+    assert response.status_code == 200
+    assert 'N+1 в GET /lazy/' in caplog.text, (
+        'Убедитесь, что вне тестов найденный N+1 пишется в лог.'
+    )
+
+
+@pytest.mark.django_db
+def test_pages_with_many_comments_have_no_n_plus_one(
+        mixer, user_client, admin_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(6).blend('blog.Comment', post=post, author=user)
+    for url in (
+        f'/posts/{post.pk}/',
+        f'/posts/{post.pk}/comments/',
+        '/admin/blog/comment/',
+    ):
+        client = admin_client if url.startswith('/admin/') else user_client
+        assert client.get(url).status_code == 200, url
+    user_client.post(
+        f'/posts/{post.pk}/delete_comment/{comments[0].pk}/'
+    )
+    user_client.post(f'/posts/{post.pk}/delete/')
+    assert not Post.objects.filter(pk=post.pk).exists()
+
+
+@pytest.mark.django_db
+def test_comment_delete_reads_no_relations(
+        mixer, user, post_with_published_location
+):
+    comment = mixer.blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+    comment = Comment.objects.get(pk=comment.pk)
+    with CaptureQueriesContext(connection) as queries:
+        comment.delete()
+    assert not any(
+        f'FROM "{table}"' in query['sql']
+        for query in queries for table in ('auth_user', 'blog_category')
+    ), 'Убедитесь, что сигналы удаления комментария не загружают связи.'
+
+
+@pytest.mark.django_db
+def test_middleware_checks_sampled_requests(
+        settings, mixer, user, post_with_published_location
+):
+    mixer.cycle(6).blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+    request = RequestFactory().get('/lazy/')
+    settings.N_PLUS_ONE_SAMPLE_RATE = 0
+    response = NPlusOneMiddleware(lazy_view)(request)
+    assert response.status_code == 200, (
+        'Убедитесь, что запросы вне выборки не проверяются на N+1.'
+    )
+
+
+def test_production_samples_detection():
+    from blogicum import settings_asgi, settings_production
+
+    assert settings_production.N_PLUS_ONE_DETECTION
+    assert 0 < settings_production.N_PLUS_ONE_SAMPLE_RATE < 1, (
+        'Убедитесь, что в работе N+1 ищется в доле запросов.'
+    )
+    assert 'blog.middleware.NPlusOneMiddleware' not in (
+        settings_asgi.MIDDLEWARE
+    ), 'Убедитесь, что синхронный поиск N+1 не подключён под ASGI.'
+
+
+@pytest.mark.django_db
+def test_failed_post_delete_keeps_comment_counter(
+        mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend('blog.Comment', post=post, author=user)
+
+    def fail(sender, instance, **kwargs):
+        raise RuntimeError('ошибка удаления')
+
+    pre_delete.connect(fail, sender=Post)
+    try:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            Post.objects.get(pk=post.pk).delete()
+    finally:
+        pre_delete.disconnect(fail, sender=Post)
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что после неудачного удаления публикации удаление'
+        ' комментария уменьшает счётчик.'
+    )
@@ -0,0 +1,53 @@
+import pytest
+
+from blog.changelog import apply_pending
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_is_cached(
+        client, post_with_published_location, django_assert_num_queries
+):
+    client.get('/')
+    with django_assert_num_queries(0):
+        response = client.get('/')
+    assert post_with_published_location.title in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_logged_in_user_bypasses_page_cache(
+        user_client, post_with_published_location
+):
+    user_client.get('/')
+    response = user_client.get('/')
+    assert response.context is not None, (
+        'Убедитесь, что для авторизованных пользователей страница ленты'
+        ' не берётся из кэша.'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url', ['/', '/category/{slug}/', '/profile/{username}/']
+)
+def test_page_cache_invalidated_by_changes(
+        mixer, client, user, post_with_published_location, url
+):
+    post = post_with_published_location
+    url = url.format(slug=post.category.slug, username=user.username)
+    client.get(url)
+
+    post.title = 'Изменённый заголовок'
+    post.save()
+    assert 'Изменённый заголовок' in client.get(url).content.decode()
+
+    mixer.blend('blog.Comment', post=post, author=user)
+    assert 'Комментарии (1)' in client.get(url).content.decode()
+
+    post.category.is_published = False
+    post.category.save()
+    apply_pending()
+    response = client.get(url)
+    assert 'Изменённый заголовок' not in response.content.decode(), (
+        'Убедитесь, что кэш страницы сбрасывается при снятии категории'
+        ' с публикации.'
+    )
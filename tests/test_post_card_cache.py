@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_post_card_cache_follows_related_changes(
+        mixer, client, user, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in client.get('/').content.decode()
+
+    post.category.title = 'Новое название категории'
+    post.category.save()
+    post.location.name = 'Новое место'
+    post.location.save()
+    user.username = 'renamed_author'
+    user.save()
+    mixer.blend('blog.Comment', post=post, author=user)
+    content = client.get('/').content.decode()
+    for expected in (
+        'Новое название категории',
+        'Новое место',
+        '@renamed_author',
+        'Комментарии (1)',
+    ):
+        assert expected in content, (
+            'Убедитесь, что карточка публикации перерисовывается после'
+            ' изменения публикации, её категории, места, автора или'
+            ' количества комментариев.'
+        )
+
@@ -0,0 +1,65 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+
+@pytest.fixture
+def profiling_log(settings, tmp_path):
+    settings.PROFILING_ENABLED = True
+    settings.PROFILING_SAMPLE_RATE = 1
+    settings.PROFILING_LOG_FILE = tmp_path / 'profiling.jsonl'
+    return settings.PROFILING_LOG_FILE
+
+
+def read_log(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.django_db
+def test_profiling_records_requests(
+        profiling_log, post_with_published_location
+):
+    client = Client()
+    client.get('/')
+    client.get(f'/posts/{post_with_published_location.pk}/')
+    records = read_log(profiling_log)
+    assert [record['view'] for record in records] == [
+        'blog:index', 'blog:post_detail'
+    ], 'Убедитесь, что в журнал пишется имя представления.'
+    for record in records:
+        assert record['status'] == 200
+        assert record['sql_count'] > 0
+        assert record['render_ms'] is not None
+        assert record['total_ms'] >= record['render_ms']
+
+
+@pytest.mark.django_db
+def test_profiling_sampling_and_threshold(settings, profiling_log):
+    settings.PROFILING_SAMPLE_RATE = 0
+    Client().get('/pages/about/')
+    assert not profiling_log.exists(), (
+        'Убедитесь, что быстрые запросы вне выборки не попадают в журнал.'
+    )
+    settings.PROFILING_SLOW_MS = 0
+    Client().get('/pages/about/')
+    assert len(read_log(profiling_log)) == 1
+
+
+def test_profile_report(tmp_path):
+    log = tmp_path / 'profiling.jsonl'
+    log.write_text('\n'.join(json.dumps({
+        'view': view, 'total_ms': total, 'sql_count': 3, 'sql_ms': 1.0,
+        'render_ms': 2.0,
+    }) for view, total in [
+        ('blog:index', 10), ('blog:index', 30), ('blog:post_detail', 5),
+    ]))
+    out = StringIO()
+    call_command('profile_report', str(log), stdout=out)
+    lines = out.getvalue().splitlines()
+    assert lines[1].startswith('blog:index'), (
+        'Убедитесь, что отчёт сортирует представления по p95.'
+    )
+    assert '30' in lines[1]
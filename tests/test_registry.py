@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import registry
+from blog.mixins import CommonMixin
+from blog.models import Category
+
+
+@pytest.mark.django_db
+def test_feed_query_has_no_lookup_joins(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend('blog.Category', is_published=False)
+    sql = str(CommonMixin().get_queryset().query)
+    assert 'blog_category' not in sql and 'blog_location' not in sql, (
+        'Убедитесь, что лента не присоединяет категории и местоположения.'
+    )
+    if connection.vendor == 'sqlite':
+        plan = CommonMixin().get_queryset()[:10].explain()
+        assert 'USING INDEX post_feed_idx' in plan, plan
+        assert 'TEMP B-TREE' not in plan, plan
+
+    client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/category/{post.category.slug}/?page=1')
+    content = response.content.decode()
+    assert post.location.name in content and post.category.title in content
+    assert not any(
+        'FROM "blog_category"' in query['sql'] for query in queries
+    ), 'Убедитесь, что страница категории не запрашивает категорию из БД.'
+
+
+@pytest.mark.django_db
+def test_registry_follows_changes(client, published_category):
+    assert registry.published_category(published_category.slug)
+    published_category.is_published = False
+    published_category.save()
+    assert registry.published_category(published_category.slug) is None
+    response = client.get(f'/category/{published_category.slug}/')
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_registry_expires(monkeypatch, published_category):
+    assert registry.published_category(published_category.slug)
+    Category.objects.filter(pk=published_category.pk).update(
+        is_published=False
+    )
+    assert registry.published_category(published_category.slug)
+    monkeypatch.setattr(registry, 'MAX_AGE', 0)
+    assert registry.published_category(published_category.slug) is None, (
+        'Убедитесь, что справочники перечитываются не реже, чем раз в'
+        ' MAX_AGE секунд, даже без сброса версии.'
+    )
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connections
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+
+from blog.db import ReplicaRouter, reading_from
+from blog.middleware import ReplicaRoutingMiddleware
+from blog.models import Post
+
+pytestmark = pytest.mark.django_db(
+    transaction=True, databases=['default', 'replica']
+)
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+
+
+def replica_queries(client, url):
+    with CaptureQueriesContext(connections['replica']) as queries:
+        response = client.get(url)
+    assert response.status_code == 200, url
+    return len(queries)
+
+
+def test_read_pages_use_replica(
+        replicas, client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in ('/', f'/posts/{post.pk}/', f'/profile/{post.author}/'):
+        assert replica_queries(client, url) > 0, (
+            f'Убедитесь, что страница {url} читает данные с реплики.'
+        )
+    assert replica_queries(user_client, f'/posts/{post.pk}/edit/') == 0, (
+        'Убедитесь, что формы редактирования читают с основной базы.'
+    )
+
+
+def test_reads_stick_to_primary_after_write(
+        replicas, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response = user_client.post(
+        f'/posts/{post.pk}/comment/', {'text': 'Новый комментарий'}
+    )
+    assert 'primary_until' in response.cookies
+    assert replica_queries(user_client, f'/posts/{post.pk}/') == 0, (
+        'Убедитесь, что после записи пользователь какое-то время читает'
+        ' с основной базы.'
+    )
+
+
+def test_router(replicas, post_with_published_location):
+    with reading_from('replica'):
+        post = Post.objects.get(pk=post_with_published_location.pk)
+        post.title = 'Изменено'
+        with CaptureQueriesContext(connections['default']) as queries:
+            post.save()
+    assert post._state.db == 'default'
+    assert any('UPDATE' in query['sql'] for query in queries), (
+        'Убедитесь, что запись всегда идёт в основную базу.'
+    )
+
+
+def test_async_pages_use_replica(
+        replicas, settings, monkeypatch, post_with_published_location
+):
+    from blogicum import settings_asgi
+
+    settings.ROOT_URLCONF = settings_asgi.ROOT_URLCONF
+    settings.MIDDLEWARE = settings_asgi.MIDDLEWARE
+    aliases = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def record(self, model, **hints):
+        aliases.append(db_for_read(self, model, **hints))
+        return aliases[-1]
+
+    monkeypatch.setattr(ReplicaRouter, 'db_for_read', record)
+
+    async def fetch():
+        return await AsyncClient().get(
+            f'/posts/{post_with_published_location.pk}/'
+        )
+
+    response = async_to_sync(fetch)()
+    assert response.status_code == 200
+    assert 'replica' in aliases, (
+        'Убедитесь, что под ASGI страницы чтения читают с реплики.'
+    )
+
+    async def get_response(request):
+        pass
+
+    assert asyncio.iscoroutinefunction(
+        ReplicaRoutingMiddleware(get_response)
+    ), 'Убедитесь, что middleware реплик умеет работать асинхронно.'
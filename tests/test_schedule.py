@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.cache import shared_cache
+from blog.models import Post
+from blog.schedule import (
+    NEXT_PUBLICATION_KEY,
+    cache_timeout,
+    next_publication
+)
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+
+
+@pytest.mark.django_db
+def test_next_publication_tracks_scheduled_posts(
+        scheduled_post, django_assert_num_queries
+):
+    assert next_publication() == scheduled_post.pub_date
+    with django_assert_num_queries(0):
+        assert next_publication() == scheduled_post.pub_date
+
+    scheduled_post.is_published = False
+    scheduled_post.save()
+    assert next_publication() is None, (
+        'Убедитесь, что граница отложенной публикации пересчитывается'
+        ' при изменении публикации.'
+    )
+    assert cache_timeout(600) == 600
+
+
+@pytest.mark.django_db
+def test_cache_timeout_stops_at_next_publication(scheduled_post):
+    assert 0 < cache_timeout(600) <= 30
+    assert cache_timeout(10) == 10
+
+
+@pytest.mark.django_db
+def test_feed_expiry_headers(client, user_client, scheduled_post):
+    response = client.get('/')
+    assert 'max-age=' in response['Cache-Control']
+    max_age = int(response['Cache-Control'].split('max-age=')[1])
+    assert 0 < max_age <= 30, (
+        'Убедитесь, что срок кэширования ленты в браузере заканчивается'
+        ' к моменту ближайшей отложенной публикации.'
+    )
+    assert response.has_header('Expires')
+    assert not user_client.get('/').has_header('Expires')
+
+
+@pytest.mark.django_db
+def test_missing_publication_is_cached(mixer, user):
+    post = mixer.blend('blog.Post', author=user, pub_date=timezone.now())
+    assert next_publication() is None
+    # Изменение в обход сигналов: границу никто не сбросил.
+    pub_date = timezone.now() + timedelta(hours=1)
+    Post.objects.filter(pk=post.pk).update(pub_date=pub_date)
+    assert next_publication() is None
+    # Срок NEXT_PUBLICATION_TTL истёк.
+    shared_cache().delete(NEXT_PUBLICATION_KEY)
+    assert next_publication() == pub_date, (
+        'Убедитесь, что отсутствие отложенных публикаций кэшируется до'
+        ' истечения срока и затем пересчитывается.'
+    )
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog.changelog import apply_pending
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Поиск на SQLite FTS5.'
+)
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category, published_location):
+    def blend(title, text, **kwargs):
+        return mixer.blend(
+            'blog.Post', author=user, title=title, text=text,
+            category=published_category, location=published_location,
+            **kwargs
+        )
+
+    posts = {
+        'title': blend('Полёт на Марс', 'Рассказ о путешествии.'),
+        'text': blend('Дневник', 'Сегодня обсуждали полёт к звёздам.'),
+        'hidden': blend('Полёт скрыт', 'Текст', is_published=False),
+        'future': blend(
+            'Полёт позже', 'Текст',
+            pub_date=timezone.now() + timedelta(days=1),
+        ),
+    }
+    apply_pending()
+    return posts
+
+
+def found(client, query):
+    response = client.get('/search/', {'q': query})
+    return list(response.context['page_obj']), response.content.decode()
+
+
+@pytest.mark.django_db
+def test_search_ranks_and_hides_invisible_posts(client, searchable_posts):
+    posts, content = found(client, 'полёт')
+    assert posts == [searchable_posts['title'], searchable_posts['text']], (
+        'Убедитесь, что поиск учитывает правила видимости лент и ставит'
+        ' совпадения в заголовке выше совпадений в тексте.'
+    )
+    assert '<mark>полёт</mark>' in content
+
+
+@pytest.mark.django_db
+def test_search_index_follows_changes(client, searchable_posts):
+    post = searchable_posts['text']
+    post.location.name = 'Байконур'
+    post.location.save()
+    apply_pending()
+    assert post in found(client, 'байконур')[0]
+
+    post.text = 'Другой текст'
+    post.save()
+    apply_pending()
+    assert post not in found(client, 'звёздам')[0]
+
+    post.delete()
+    apply_pending()
+    assert found(client, 'байконур')[0] == [searchable_posts['title']]
+
+
+@pytest.mark.django_db
+def test_search_tolerates_fts_syntax(client, searchable_posts):
+    assert found(client, 'Марс" (*')[0] == [searchable_posts['title']]
+    assert found(client, '')[0] == []
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index(client, searchable_posts):
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM blog_post_fts')
+    assert found(client, 'марс')[0] == []
+    call_command('rebuild_search_index', stdout=StringIO())
+    assert found(client, 'марс')[0] == [searchable_posts['title']]
+
+
+@pytest.mark.django_db
+def test_admin_post_search(admin_client, searchable_posts):
+    response = admin_client.get('/admin/blog/post/', {'q': 'звёзд'})
+    assert list(response.context['cl'].result_list) == [
+        searchable_posts['text']
+    ]
+    response = admin_client.get('/admin/blog/post/', {'q': '"*( -'})
+    assert response.status_code == 200, (
+        'Убедитесь, что поиск в админке без слов не падает.'
+    )
+    assert not response.context['cl'].result_list
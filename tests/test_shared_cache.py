@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from blog.cache import get_versions
+from blog.cache_backends import FileBasedCache
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def test_versions_are_shared_between_processes(shared_cache_location):
+    before, = get_versions('post:1')
+    subprocess.run(
+        [
+            sys.executable, 'manage.py', 'shell', '-c',
+            'from blog.cache import bump_versions; bump_versions("post:1")',
+        ],
+        cwd=PROJECT_DIR, check=True, capture_output=True,
+        env={**os.environ, 'SHARED_CACHE_LOCATION': shared_cache_location},
+    )
+    after, = get_versions('post:1')
+    assert after != before, (
+        'Убедитесь, что версии ключей хранятся в кэше, общем для всех'
+        ' процессов: сброс из команды должны видеть веб-процессы.'
+    )
+
+
+def test_shared_file_cache_rarely_lists_directory(tmp_path, monkeypatch):
+    cache = FileBasedCache(str(tmp_path), {'OPTIONS': {'CULL_EVERY': 10**9}})
+    listed = []
+    monkeypatch.setattr(
+        cache, '_list_cache_files', lambda: listed.append(1) or []
+    )
+    for number in range(200):
+        cache.set(f'key:{number}', number, None)
+    assert len(listed) < 5, (
+        'Убедитесь, что общий файловый кэш не перечисляет каталог на'
+        ' каждой записи.'
+    )
+    assert cache.get('key:199') == 199
@@ -0,0 +1,20 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db
+def test_new_connections_get_pragmas(settings):
+    settings.SQLITE_PRAGMAS = {'cache_size': -1234, 'temp_store': 'MEMORY'}
+    fresh = connection.copy()
+    try:
+        with fresh.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size')
+            cache_size, = cursor.fetchone()
+            cursor.execute('PRAGMA temp_store')
+            temp_store, = cursor.fetchone()
+    finally:
+        fresh.close()
+    assert (cache_size, temp_store) == (-1234, 2), (
+        'Убедитесь, что новое подключение SQLite получает PRAGMA из'
+        ' SQLITE_PRAGMAS.'
+    )
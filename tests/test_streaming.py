@@ -0,0 +1,81 @@
+import pytest
+from django.core.cache import caches
+from django.views.generic import ListView
+
+from blog.mixins import StreamingListMixin
+from blog.models import Location
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    monkeypatch.setattr(StreamingListMixin, 'streaming', True)
+
+
+def streamed_content(response):
+    assert response.streaming, (
+        'Убедитесь, что при включённой потоковой отдаче страница отдаётся'
+        ' через StreamingHttpResponse.'
+    )
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url', ['/', '/category/{slug}/', '/profile/{username}/']
+)
+def test_list_pages_stream_same_html(
+        client, monkeypatch, mixer, user, published_category, url
+):
+    posts = mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category
+    )
+    url = url.format(slug=published_category.slug, username=user.username)
+    buffered = client.get(url).content.decode()
+    for cache in caches.all():
+        cache.clear()
+    monkeypatch.setattr(StreamingListMixin, 'streaming', True)
+    content = streamed_content(client.get(url))
+    assert content.split() == buffered.split(), (
+        'Убедитесь, что потоковая отдача выдаёт ту же страницу.'
+    )
+    assert all(post.title in content for post in posts)
+
+
+@pytest.mark.django_db
+def test_streamed_feed_is_cached(
+        client, streaming, post_with_published_location
+):
+    first = streamed_content(client.get('/'))
+    response = client.get('/')
+    assert not response.streaming and response.content.decode() == first, (
+        'Убедитесь, что собранная потоковая страница попадает в кэш.'
+    )
+
+
+@pytest.mark.django_db
+def test_comments_stream(
+        user_client, streaming, mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend('blog.Comment', post=post, author=user)
+    content = streamed_content(user_client.get(f'/posts/{post.pk}/'))
+    assert all(f'name="comment_{c.pk}"' in content for c in comments)
+    assert 'Отредактировать комментарий' in content
+    assert content.rstrip().endswith('</html>')
+
+
+@pytest.mark.django_db
+def test_default_stream_items(mixer, rf):
+    locations = mixer.cycle(3).blend('blog.Location')
+
+    class LocationListView(StreamingListMixin, ListView):
+        model = Location
+        ordering = 'pk'
+
+    view = LocationListView()
+    view.setup(rf.get('/'))
+    page = Location.objects.order_by('pk')[:2]
+    assert list(view.get_stream_items({'object_list': page})) == (
+        locations[:2]
+    ), 'Убедитесь, что по умолчанию отдаются элементы `object_list`.'
+    assert list(view.get_stream_items({})) == locations
@@ -0,0 +1,115 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from blog.models import Category, Comment, Post
+
+
+@pytest.fixture
+def blog_data(mixer, user, another_user, post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(
+        created_at=timezone.now() - timedelta(days=30)
+    )
+    mixer.cycle(3).blend('blog.Comment', post=post, author=another_user)
+    mixer.blend('blog.Post', author=another_user, category=None)
+    return post
+
+
+def snapshot():
+    return sorted(
+        Post.objects.values_list(
+            'title', 'created_at', 'author__username', 'category__slug',
+            'location__name', 'comment_count'
+        )
+    ), sorted(Comment.objects.values_list(
+        'post__title', 'author__username', 'text', 'created_date'
+    ))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('export_format', ['jsonl', 'csv'])
+def test_export_import_round_trip(blog_data, tmp_path, export_format):
+    before = snapshot()
+    path = tmp_path / ('blog.jsonl' if export_format == 'jsonl' else 'csv')
+    call_command(
+        'export_blog', str(path), format=export_format, stdout=StringIO()
+    )
+    Post.objects.all().delete()
+    Category.objects.all().delete()
+    out = StringIO()
+    call_command('import_blog', str(path), batch_size=2, stdout=out)
+    assert snapshot() == before, (
+        'Убедитесь, что после выгрузки и загрузки публикации и комментарии'
+        ' совпадают с исходными, включая даты создания и связи.'
+    )
+    assert 'записей/с' in out.getvalue(), (
+        'Убедитесь, что import_blog сообщает скорость загрузки.'
+    )
+
+
+@pytest.mark.django_db
+def test_import_rejects_unknown_author(tmp_path, published_category):
+    path = tmp_path / 'blog.jsonl'
+    path.write_text(json.dumps({'model': 'post', 'fields': {
+        'ref': 1, 'title': 'Заголовок', 'text': 'Текст',
+        'pub_date': '2024-01-01T00:00:00+00:00', 'author': 'nobody',
+        'category': published_category.slug, 'location': None, 'image': '',
+        'is_published': True, 'created_at': '2024-01-01T00:00:00+00:00',
+    }}) + '\n')
+    with pytest.raises(CommandError, match='nobody'):
+        call_command('import_blog', str(path), stdout=StringIO())
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('field, value', [
+    ('ref', 'один'),
+    ('pub_date', '01.01.2024'),
+    ('created_at', '2024-13-01T00:00:00'),
+])
+def test_import_reports_bad_values(
+        tmp_path, user, published_category, field, value
+):
+    fields = {
+        'ref': 1, 'title': 'Заголовок', 'text': 'Текст',
+        'pub_date': '2024-01-01T00:00:00+00:00', 'author': user.username,
+        'category': published_category.slug, 'location': None, 'image': '',
+        'is_published': True, 'created_at': '2024-01-01T00:00:00+00:00',
+    }
+    path = tmp_path / 'blog.jsonl'
+    path.write_text(
+        '\n'.join(
+            json.dumps({'model': 'post', 'fields': {**fields, **changes}})
+            for changes in ({}, {'ref': 2, field: value})
+        ) + '\n'
+    )
+    with pytest.raises(CommandError, match=f'Запись 2: .*{field}'):
+        call_command('import_blog', str(path), stdout=StringIO())
+    assert not Post.objects.exists(), (
+        'Убедитесь, что неверное значение поля отменяет загрузку с понятной'
+        ' ошибкой.'
+    )
+
+
+@pytest.mark.django_db
+def test_failed_import_changes_nothing(blog_data, another_user, tmp_path):
+    path = tmp_path / 'blog.jsonl'
+    call_command('export_blog', str(path), stdout=StringIO())
+    broken = path.read_text().replace(
+        f'"author": "{another_user.username}"', '"author": "nobody"'
+    )
+    path.write_text(broken)
+    Post.objects.all().delete()
+    with pytest.raises(CommandError, match='nobody'):
+        call_command(
+            'import_blog', str(path), batch_size=1, stdout=StringIO()
+        )
+    assert snapshot() == ([], []), (
+        'Убедитесь, что при ошибке import_blog не оставляет в базе'
+        ' записанные до неё пачки.'
+    )
@@ -0,0 +1,78 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import UserStats
+
+
+def stats_of(user):
+    stats = UserStats.objects.get(user=user)
+    return stats.posts_published, stats.posts_total, stats.comments
+
+
+@pytest.mark.django_db
+def test_user_stats_follow_changes(mixer, user, another_user):
+    posts = mixer.cycle(3).blend('blog.Post', author=user, is_published=True)
+    mixer.blend('blog.Comment', post=posts[0], author=user)
+    assert stats_of(user) == (3, 3, 1)
+
+    posts[0].is_published = False
+    posts[0].save()
+    posts[1].author = another_user
+    posts[1].save()
+    posts[2].delete()
+    assert stats_of(user) == (0, 1, 1), (
+        'Убедитесь, что статистика пользователя обновляется при снятии с'
+        ' публикации, смене автора и удалении публикации.'
+    )
+    assert stats_of(another_user) == (1, 1, 0)
+    assert UserStats.objects.get(user=user).last_activity is not None
+
+
+@pytest.mark.django_db
+def test_recount_user_stats_command(mixer, user):
+    mixer.cycle(2).blend('blog.Post', author=user, is_published=False)
+    UserStats.objects.all().delete()
+    call_command('recount_user_stats', '--batch-size=1', stdout=StringIO())
+    assert stats_of(user) == (0, 2, 0)
+
+
+def profile_queries(client, username):
+    for cache in caches.all():
+        cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/profile/{username}/')
+    return response.content.decode(), len(queries)
+
+
+@pytest.mark.django_db
+def test_profile_shows_stats_in_constant_queries(client, mixer, user):
+    mixer.blend('blog.Post', author=user, is_published=True)
+    _, few = profile_queries(client, user.username)
+    mixer.cycle(12).blend('blog.Comment', author=user)
+    content, many = profile_queries(client, user.username)
+    assert 'Комментариев: 12' in content, (
+        'Убедитесь, что на странице профиля выводится статистика'
+        ' пользователя.'
+    )
+    assert many == few
+
+
+@pytest.mark.django_db
+def test_delete_user_with_comments(mixer, user, another_user):
+    posts = mixer.cycle(2).blend('blog.Post', author=user, is_published=True)
+    mixer.cycle(3).blend('blog.Comment', post=posts[0], author=user)
+    mixer.cycle(2).blend('blog.Comment', post=posts[0], author=another_user)
+    other_post = mixer.blend('blog.Post', author=another_user)
+    mixer.cycle(2).blend('blog.Comment', post=other_post, author=user)
+    user_id = user.pk
+    user.delete()
+    assert not UserStats.objects.filter(user_id=user_id).exists()
+    assert stats_of(another_user)[2] == 0, (
+        'Убедитесь, что при удалении пользователя со статистикой других'
+        ' пользователей вычитаются комментарии к его публикациям.'
+    )